@@ -15,23 +15,26 @@ OFF→ON に切り替わった日付（重要イベント）を抽出する。
 import os
 import sys
 import io
-
-# Windows環境でのUTF-8出力対応
-if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-
-import requests
+import asyncio
+import logging
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime, timedelta
-import yfinance as yf
 
 # 設定をインポート
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import config
+import data_provider
+
 
+# 取得済みレスポンスのキャッシュ有効期限（再実行時のネットワークアクセスを省略）
+CACHE_TTL = 24 * 3600  # 1日（FRED/USDJPYとも週次データのため日中は変化しない）
 
-def fetch_fred_series(series_id: str, start_date: str, end_date: str) -> pd.DataFrame:
+
+async def fetch_fred_series(session: aiohttp.ClientSession, series_id: str, start_date: str, end_date: str) -> pd.DataFrame:
     """FREDから時系列データを取得"""
     if config.FRED_API_KEY == "YOUR_FRED_API_KEY_HERE" or not config.FRED_API_KEY:
         print(f"⚠️ FRED APIキーが未設定です")
@@ -47,36 +50,82 @@ def fetch_fred_series(series_id: str, start_date: str, end_date: str) -> pd.Data
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            observations = data.get("observations", [])
-            df = pd.DataFrame(observations)
-            if not df.empty:
-                df["date"] = pd.to_datetime(df["date"])
-                df["value"] = pd.to_numeric(df["value"], errors="coerce")
-                df = df.dropna(subset=["value"])
-                df = df.set_index("date")
-                return df[["value"]]
+        data = await data_provider._request_handler(session, url, params=params, ttl=CACHE_TTL)
+        observations = data.get("observations", [])
+        # 欠損値は "." で返るため除外し、dictのリストを経由せず列配列を直接組み立てる
+        observations = [o for o in observations if o["value"] != "."]
+        if observations:
+            count = len(observations)
+            dates = np.fromiter((o["date"] for o in observations), dtype="<U10", count=count)
+            values = np.fromiter((float(o["value"]) for o in observations), dtype="float64", count=count)
+            df = pd.DataFrame(
+                {"value": values},
+                index=pd.DatetimeIndex(pd.to_datetime(dates, format="%Y-%m-%d", cache=True), name="date"),
+            )
+            return df
     except Exception as e:
         print(f"❌ FRED取得エラー ({series_id}): {e}")
 
     return pd.DataFrame()
 
 
-def fetch_usdjpy_history(start_date: str, end_date: str) -> pd.DataFrame:
-    """Yahoo FinanceからUSDJPYの履歴を取得"""
-    try:
-        ticker = yf.Ticker("USDJPY=X")
-        df = ticker.history(start=start_date, end=end_date, interval="1wk")
-        if not df.empty:
-            df = df[["Close"]].rename(columns={"Close": "value"})
-            df.index = pd.to_datetime(df.index).tz_localize(None)
-            return df
-    except Exception as e:
-        print(f"❌ USDJPY取得エラー: {e}")
+async def fetch_usdjpy_history(session: aiohttp.ClientSession, start_date: str, end_date: str) -> pd.DataFrame:
+    """Yahoo FinanceからUSDJPYの週次履歴を取得"""
+    history = await data_provider.get_yahoo_history(session, "USDJPY=X", start_date, end_date, interval="1wk", ttl=CACHE_TTL)
+    if not history:
+        print("❌ USDJPY取得エラー")
+        return pd.DataFrame()
 
-    return pd.DataFrame()
+    # 取引所タイムゾーンの日付に揃えてからタイムゾーン情報を外す
+    index = (
+        pd.to_datetime(history["timestamps"], unit="s", utc=True)
+        .tz_convert(history["timezone"])
+        .tz_localize(None)
+        .normalize()
+    )
+    return pd.DataFrame({"value": history["closes"]}, index=index.rename("date"))
+
+
+async def fetch_all_series(start_date: str, end_date: str):
+    """
+    WALCL / SWPT / TREAST / USDJPY を並列取得
+
+    FRED・Yahoo Financeとも同一のaiohttpセッションで同時に取得し、
+    待ち時間を4本分の合計ではなく最長の1本分に抑える。
+    """
+    # 同一ホストへの接続はkeep-aliveで使い回す（FRED 3本は api.stlouisfed.org に集約）
+    connector = aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            fetch_fred_series(session, "WALCL", start_date, end_date),
+            fetch_fred_series(session, "SWPT", start_date, end_date),
+            fetch_fred_series(session, "TREAST", start_date, end_date),
+            fetch_usdjpy_history(session, start_date, end_date),
+        )
+
+
+def rolling_mean_std(values: np.ndarray, window: int, min_periods: int):
+    """
+    移動平均と標本標準偏差（ddof=1）を1回の窓走査で同時に計算
+
+    先頭を NaN で埋めた配列のスライディングウィンドウ（コピーなしのビュー）上で
+    合計・偏差二乗和をまとめて求める。NaN は除外し、有効件数が min_periods 未満の
+    位置は NaN とする（pandas の rolling(...).mean()/.std() と同じ扱い）。
+    """
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = sliding_window_view(padded, window)
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=1) / counts
+        deviations = np.where(valid, windows - mean[:, None], 0.0)
+        std = np.sqrt((deviations * deviations).sum(axis=1) / (counts - 1))
+
+    insufficient = counts < min_periods
+    mean[insufficient] = np.nan
+    std[insufficient] = np.nan
+    return mean, std
 
 
 def calculate_weekly_metrics(df: pd.DataFrame, lookback_weeks: int = 52) -> pd.DataFrame:
@@ -89,139 +138,177 @@ def calculate_weekly_metrics(df: pd.DataFrame, lookback_weeks: int = 52) -> pd.D
     df["change_pct"] = df["value"].pct_change() * 100
     # 絶対変化量
     df["change_abs"] = df["value"].diff()
-    # 52週移動平均と標準偏差
-    df["mean_52w"] = df["value"].rolling(window=lookback_weeks, min_periods=10).mean()
-    df["std_52w"] = df["value"].rolling(window=lookback_weeks, min_periods=10).std()
-    # z-score
-    df["zscore"] = (df["value"] - df["mean_52w"]) / df["std_52w"].replace(0, float("nan"))
+    # 52週移動平均と標準偏差（1回の窓走査でまとめて計算。z-scoreの中間値なので列には残さない）
+    values = df["value"].to_numpy(dtype="float64")
+    mean, std = rolling_mean_std(values, lookback_weeks, min_periods=10)
+    # z-score（標準偏差0の週は NaN）
+    with np.errstate(invalid="ignore", divide="ignore"):
+        df["zscore"] = (values - mean) / np.where(std == 0, np.nan, std)
 
     return df
 
 
-def evaluate_hidden_qe_conditions(
-    walcl_row, swpt_row, treast_row, usdjpy_row
-) -> dict:
+def align_weekly_series(dates, walcl, swpt, treast, usdjpy) -> pd.DataFrame:
+    """
+    各データソースを共通の日付列に揃える
+
+    FRED系列は「その日付以前の最新値」、USDJPYは「最も近い日付の値」を
+    merge_asof で一括結合する（週ごとのスライスを繰り返さない）。
+    列名には "walcl_value" のように系列名のプレフィックスを付ける。
+    """
+    merged = pd.DataFrame({"date": pd.DatetimeIndex(dates)})
+    sources = [
+        ("walcl", walcl, "backward"),
+        ("swpt", swpt, "backward"),
+        ("treast", treast, "backward"),
+        ("usdjpy", usdjpy, "nearest"),
+    ]
+    for name, df, direction in sources:
+        right = df.add_prefix(f"{name}_").rename_axis("date").reset_index().sort_values("date")
+        merged = pd.merge_asof(merged, right, on="date", direction=direction)
+    return merged
+
+
+def evaluate_hidden_qe_conditions(merged: pd.DataFrame) -> pd.DataFrame:
+    """
+    全週のデータに対して隠れQE判定を一括実行（列単位のベクトル演算）
+
+    Args:
+        merged: align_weekly_series() の出力
+
+    Returns:
+        pd.DataFrame: {
+            "date": 日付,
+            "total_assets" / "treasury" / "swaps" / "usdjpy": 各条件の成否 (bool),
+            "score": int (0-4),
+            "signal": "ON" | "WATCH" | "OFF"
+        }
+    """
+    # ※ NaN との比較は常に False になるため、データ欠損週の条件は不成立となる
+
+    # 閾値は関数冒頭で一度だけ読み出す
+    assets_th = config.TOTAL_ASSETS_INCREASE_THRESHOLD
+    treasury_th = config.TREASURY_HOLDINGS_INCREASE_THRESHOLD
+    swaps_min_value = config.SWAPS_MINIMUM_VALUE
+    swaps_pct_th = config.SWAPS_SURGE_THRESHOLD_PCT
+    swaps_abs_th = config.SWAPS_SURGE_THRESHOLD_ABS
+    swaps_z_th = config.SWAPS_SURGE_ZSCORE_THRESHOLD
+    usdjpy_weak_th = config.USDJPY_WEAKENING_THRESHOLD
+    usdjpy_high_level = config.USDJPY_HIGH_LEVEL
+    usdjpy_high_vol = config.USDJPY_HIGH_VOLATILITY
+    signal_on = config.HIDDEN_QE_SIGNAL_ON
+    signal_watch = config.HIDDEN_QE_SIGNAL_WATCH
+
+    # 条件1: Total Assets（WALCL）> +0.1%
+    total_assets = merged["walcl_change_pct"] > assets_th
+
+    # 条件2: Treasury Holdings（TREAST）< +0.5%
+    treasury = merged["treast_change_pct"] < treasury_th
+
+    # 条件3: Central Bank Swaps（SWPT）急増
+    swpt_change_pct = merged["swpt_change_pct"]
+    value_b = merged["swpt_value"].fillna(0) / 1000  # 百万ドル→10億ドル
+    change_abs_b = merged["swpt_change_abs"].fillna(0) / 1000
+    # 条件A: 週次% >= 10% かつ 週次増加額 >= 5B（かつ値が1B以上）
+    surge = (
+        (value_b >= swaps_min_value)
+        & (swpt_change_pct >= swaps_pct_th)
+        & (change_abs_b >= swaps_abs_th)
+    )
+    # 条件B: z-score >= 2.0
+    zscore_surge = merged["swpt_zscore"] >= swaps_z_th
+    swaps = swpt_change_pct.notna() & (surge | zscore_surge)
+
+    # 条件4: USDJPY 円安/介入局面
+    usdjpy_change = merged["usdjpy_change_pct"]
+    usdjpy = (
+        # 条件A: 円安進行
+        (usdjpy_change >= usdjpy_weak_th)
+        # 条件B: 高水準 & 高ボラ
+        | ((merged["usdjpy_value"] >= usdjpy_high_level)
+           & (usdjpy_change.abs() >= usdjpy_high_vol))
+    )
+
+    score = (
+        total_assets.astype("int8") + treasury.astype("int8")
+        + swaps.astype("int8") + usdjpy.astype("int8")
+    )
+
+    # シグナル判定
+    signal = np.where(
+        score >= signal_on, "ON",
+        np.where(score >= signal_watch, "WATCH", "OFF")
+    )
+
+    return pd.DataFrame({
+        "date": merged["date"],
+        "total_assets": total_assets,
+        "treasury": treasury,
+        "swaps": swaps,
+        "usdjpy": usdjpy,
+        "score": score,
+        "signal": signal,
+    })
+
+
+def build_transition(merged_row: dict, evaluated_row: dict) -> dict:
     """
-    指定された週のデータに対して隠れQE判定を実行
+    1週分の判定結果を転換日の辞書に変換
 
     Returns:
         dict: {
             "signal": "ON" | "WATCH" | "OFF",
             "score": int (0-4),
-            "conditions": {
-                "total_assets": bool,
-                "treasury": bool,
-                "swaps": bool,
-                "usdjpy": bool
-            },
-            "details": {...}
+            "conditions": {"total_assets", "treasury", "swaps", "usdjpy": bool},
+            "details": {条件名: 判定に使った値（データのある条件のみ）},
+            "date": pd.Timestamp
         }
     """
-    score = 0
     conditions = {
-        "total_assets": False,
-        "treasury": False,
-        "swaps": False,
-        "usdjpy": False,
+        key: bool(evaluated_row[key]) for key in ("total_assets", "treasury", "swaps", "usdjpy")
     }
     details = {}
 
-    # 条件1: Total Assets（WALCL）> +0.1%
-    if walcl_row is not None and pd.notna(walcl_row.get("change_pct")):
-        change = walcl_row["change_pct"]
-        met = change > config.TOTAL_ASSETS_INCREASE_THRESHOLD
-        conditions["total_assets"] = met
+    if pd.notna(merged_row["walcl_change_pct"]):
         details["total_assets"] = {
-            "value": walcl_row["value"],
-            "change": change,
-            "met": met
+            "value": merged_row["walcl_value"],
+            "change": merged_row["walcl_change_pct"],
+            "met": conditions["total_assets"]
         }
-        if met:
-            score += 1
 
-    # 条件2: Treasury Holdings（TREAST）< +0.5%
-    if treast_row is not None and pd.notna(treast_row.get("change_pct")):
-        change = treast_row["change_pct"]
-        met = change < config.TREASURY_HOLDINGS_INCREASE_THRESHOLD
-        conditions["treasury"] = met
+    if pd.notna(merged_row["treast_change_pct"]):
         details["treasury"] = {
-            "value": treast_row["value"],
-            "change": change,
-            "met": met
+            "value": merged_row["treast_value"],
+            "change": merged_row["treast_change_pct"],
+            "met": conditions["treasury"]
         }
-        if met:
-            score += 1
 
-    # 条件3: Central Bank Swaps（SWPT）急増
-    if swpt_row is not None and pd.notna(swpt_row.get("change_pct")):
-        change_pct = swpt_row["change_pct"]
-        value = swpt_row["value"]
-        value_b = value / 1000 if value else 0  # 百万ドル→10億ドル
-        change_abs = swpt_row.get("change_abs", 0) or 0
-        change_abs_b = change_abs / 1000
-        zscore = swpt_row.get("zscore", 0) or 0
-
-        met = False
-        # 条件A: 週次% >= 10% かつ 週次増加額 >= 5B（かつ値が1B以上）
-        if value_b >= config.SWAPS_MINIMUM_VALUE:
-            if (change_pct >= config.SWAPS_SURGE_THRESHOLD_PCT and
-                change_abs_b >= config.SWAPS_SURGE_THRESHOLD_ABS):
-                met = True
-
-        # 条件B: z-score >= 2.0
-        if zscore >= config.SWAPS_SURGE_ZSCORE_THRESHOLD:
-            met = True
-
-        conditions["swaps"] = met
+    if pd.notna(merged_row["swpt_change_pct"]):
+        value = merged_row["swpt_value"]
         details["swaps"] = {
             "value": value,
-            "value_b": value_b,
-            "change_pct": change_pct,
-            "change_abs_b": change_abs_b,
-            "zscore": zscore,
-            "met": met
+            "value_b": value / 1000 if value else 0,  # 百万ドル→10億ドル
+            "change_pct": merged_row["swpt_change_pct"],
+            "change_abs_b": (merged_row["swpt_change_abs"] or 0) / 1000,
+            "zscore": merged_row["swpt_zscore"] or 0,
+            "met": conditions["swaps"]
         }
-        if met:
-            score += 1
-
-    # 条件4: USDJPY 円安/介入局面
-    if usdjpy_row is not None and pd.notna(usdjpy_row.get("change_pct")):
-        change = usdjpy_row["change_pct"]
-        value = usdjpy_row["value"]
-        volatility = abs(change)
 
-        met = False
-        # 条件A: 円安進行
-        if change >= config.USDJPY_WEAKENING_THRESHOLD:
-            met = True
-        # 条件B: 高水準 & 高ボラ
-        elif (value >= config.USDJPY_HIGH_LEVEL and
-              volatility >= config.USDJPY_HIGH_VOLATILITY):
-            met = True
-
-        conditions["usdjpy"] = met
+    if pd.notna(merged_row["usdjpy_change_pct"]):
+        change = merged_row["usdjpy_change_pct"]
         details["usdjpy"] = {
-            "value": value,
+            "value": merged_row["usdjpy_value"],
             "change": change,
-            "volatility": volatility,
-            "met": met
+            "volatility": abs(change),
+            "met": conditions["usdjpy"]
         }
-        if met:
-            score += 1
-
-    # シグナル判定
-    if score >= config.HIDDEN_QE_SIGNAL_ON:
-        signal = "ON"
-    elif score >= config.HIDDEN_QE_SIGNAL_WATCH:
-        signal = "WATCH"
-    else:
-        signal = "OFF"
 
     return {
-        "signal": signal,
-        "score": score,
+        "signal": evaluated_row["signal"],
+        "score": int(evaluated_row["score"]),
         "conditions": conditions,
-        "details": details
+        "details": details,
+        "date": evaluated_row["date"]
     }
 
 
@@ -231,6 +318,10 @@ def analyze_hidden_qe_history(years: int = 5):
 
     Args:
         years: 分析対象期間（年数）
+
+    Returns:
+        OFF→ON転換週の build_transition() の結果のリスト
+        （r["conditions"][...] / r["details"][...] でアクセスする）
     """
     end_date = datetime.now()
     start_date = end_date - timedelta(days=years * 365)
@@ -243,10 +334,7 @@ def analyze_hidden_qe_history(years: int = 5):
 
     # データ取得
     print("📥 データ取得中...")
-    walcl = fetch_fred_series("WALCL", start_str, end_str)
-    swpt = fetch_fred_series("SWPT", start_str, end_str)
-    treast = fetch_fred_series("TREAST", start_str, end_str)
-    usdjpy = fetch_usdjpy_history(start_str, end_str)
+    walcl, swpt, treast, usdjpy = asyncio.run(fetch_all_series(start_str, end_str))
 
     if walcl.empty or swpt.empty or treast.empty or usdjpy.empty:
         print("❌ データ取得に失敗しました。FRED_API_KEYを確認してください。")
@@ -254,11 +342,9 @@ def analyze_hidden_qe_history(years: int = 5):
 
     print(f"   WALCL: {len(walcl)}件, SWPT: {len(swpt)}件, TREAST: {len(treast)}件, USDJPY: {len(usdjpy)}件")
 
-    # 週次メトリクス計算
-    walcl = calculate_weekly_metrics(walcl)
-    swpt = calculate_weekly_metrics(swpt)
-    treast = calculate_weekly_metrics(treast)
-    usdjpy = calculate_weekly_metrics(usdjpy)
+    # 週次メトリクス計算（系列ごとに独立しているためスレッドで並列実行）
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        walcl, swpt, treast, usdjpy = executor.map(calculate_weekly_metrics, [walcl, swpt, treast, usdjpy])
 
     # 全データを週次でリサンプリング（FREDは週次、USDJPYも週次に）
     # 共通の日付インデックスを作成
@@ -267,24 +353,13 @@ def analyze_hidden_qe_history(years: int = 5):
     # 各週について判定を実行
     print()
     print("🔍 判定実行中...")
-    results = []
-
-    for date in all_dates:
-        # 各データソースから該当日またはそれ以前の最新データを取得
-        walcl_row = walcl.loc[:date].iloc[-1].to_dict() if date in walcl.index or len(walcl.loc[:date]) > 0 else None
-        swpt_row = swpt.loc[:date].iloc[-1].to_dict() if date in swpt.index or len(swpt.loc[:date]) > 0 else None
-        treast_row = treast.loc[:date].iloc[-1].to_dict() if date in treast.index or len(treast.loc[:date]) > 0 else None
+    merged = align_weekly_series(all_dates, walcl, swpt, treast, usdjpy)
+    evaluated = evaluate_hidden_qe_conditions(merged)
 
-        # USDJPYは最も近い日付を探す
-        usdjpy_row = None
-        if not usdjpy.empty:
-            closest_idx = usdjpy.index.get_indexer([date], method="nearest")[0]
-            if closest_idx >= 0 and closest_idx < len(usdjpy):
-                usdjpy_row = usdjpy.iloc[closest_idx].to_dict()
-
-        result = evaluate_hidden_qe_conditions(walcl_row, swpt_row, treast_row, usdjpy_row)
-        result["date"] = date
-        results.append(result)
+    # 転換検出: 前週シグナルとの比較をシフト演算で一括実行（初週の前週はOFF扱い）
+    signal = evaluated["signal"]
+    prev_signal = signal.shift(1, fill_value="OFF")
+    is_on = signal == "ON"
 
     # OFF→ON 転換日を抽出
     print()
@@ -292,26 +367,19 @@ def analyze_hidden_qe_history(years: int = 5):
     print("🎯 OFF→ON 転換日（重要イベント）")
     print("=" * 70)
 
-    transitions = []
-    prev_signal = "OFF"
-
-    for r in results:
-        if prev_signal != "ON" and r["signal"] == "ON":
-            transitions.append(r)
-            date_str = r["date"].strftime("%Y-%m-%d")
-            cond = r["conditions"]
-            cond_str = ", ".join([
-                f"Assets:{'+' if cond['total_assets'] else '-'}",
-                f"Treasury:{'+' if cond['treasury'] else '-'}",
-                f"Swaps:{'+' if cond['swaps'] else '-'}",
-                f"USDJPY:{'+' if cond['usdjpy'] else '-'}"
-            ])
-            print(f"  📅 {date_str}  Score: {r['score']}/4  [{cond_str}]")
-
-        prev_signal = r["signal"]
+    off_to_on = evaluated[is_on & (prev_signal != "ON")]
+    for r in off_to_on.itertuples(index=False):
+        date_str = r.date.strftime("%Y-%m-%d")
+        cond_str = ", ".join([
+            f"Assets:{'+' if r.total_assets else '-'}",
+            f"Treasury:{'+' if r.treasury else '-'}",
+            f"Swaps:{'+' if r.swaps else '-'}",
+            f"USDJPY:{'+' if r.usdjpy else '-'}"
+        ])
+        print(f"  📅 {date_str}  Score: {r.score}/4  [{cond_str}]")
 
     print()
-    print(f"合計: {len(transitions)}件のOFF→ON転換")
+    print(f"合計: {len(off_to_on)}件のOFF→ON転換")
     print()
 
     # WATCH→ON も参考として表示
@@ -319,41 +387,37 @@ def analyze_hidden_qe_history(years: int = 5):
     print("📋 WATCH→ON 転換日（参考）")
     print("=" * 70)
 
-    watch_to_on = []
-    prev_signal = "OFF"
-    for r in results:
-        if prev_signal == "WATCH" and r["signal"] == "ON":
-            watch_to_on.append(r)
-            date_str = r["date"].strftime("%Y-%m-%d")
-            print(f"  📅 {date_str}  Score: {r['score']}/4")
-        prev_signal = r["signal"]
+    watch_to_on = evaluated[is_on & (prev_signal == "WATCH")]
+    for r in watch_to_on.itertuples(index=False):
+        date_str = r.date.strftime("%Y-%m-%d")
+        print(f"  📅 {date_str}  Score: {r.score}/4")
 
     print(f"合計: {len(watch_to_on)}件")
 
     # 詳細結果をCSVに出力
     output_file = "hidden_qe_history.csv"
-    df_results = pd.DataFrame([
-        {
-            "date": r["date"].strftime("%Y-%m-%d"),
-            "signal": r["signal"],
-            "score": r["score"],
-            "total_assets": r["conditions"]["total_assets"],
-            "treasury": r["conditions"]["treasury"],
-            "swaps": r["conditions"]["swaps"],
-            "usdjpy": r["conditions"]["usdjpy"],
-        }
-        for r in results
-    ])
-    df_results.to_csv(output_file, index=False)
+    csv_columns = ["date", "signal", "score", "total_assets", "treasury", "swaps", "usdjpy"]
+    evaluated[csv_columns].assign(
+        date=evaluated["date"].dt.strftime("%Y-%m-%d")
+    ).to_csv(output_file, index=False)
     print()
     print(f"📁 詳細結果を {output_file} に保存しました")
 
-    return transitions
+    # 転換週だけを判定前の値と合わせて辞書に変換する（全週分の辞書は作らない）
+    return [
+        build_transition(merged.loc[index].to_dict(), evaluated.loc[index].to_dict())
+        for index in off_to_on.index
+    ]
 
 
 if __name__ == "__main__":
     import argparse
 
+    # Windows環境でのUTF-8出力対応（スクリプト実行時のみ。import時は標準出力を差し替えない）
+    if sys.platform == "win32":
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
     parser = argparse.ArgumentParser(description="隠れQEシグナルの過去データ分析")
     parser.add_argument("--years", type=int, default=5, help="分析対象期間（年数、デフォルト: 5）")
     parser.add_argument("--api-key", type=str, help="FRED APIキー（環境変数FRED_API_KEYでも指定可）")
@@ -369,4 +433,7 @@ if __name__ == "__main__":
         config.FRED_API_KEY = os.environ["FRED_API_KEY"]
         print(f"✅ FRED APIキーを環境変数から設定しました")
 
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+    data_provider.install_uvloop()
+
     transitions = analyze_hidden_qe_history(years=args.years)
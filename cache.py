@@ -0,0 +1,287 @@
+"""
+APIレスポンスのキャッシュモジュール
+
+取得したJSONレスポンスをTTL付きで保存し、
+有効期限内の同一リクエストではネットワークアクセスを省略する。
+キーはURLとパラメータから生成する（make_key）。
+
+プロセス内のメモリキャッシュを1段目とし、2段目のバックエンドを環境変数 CACHE_BACKEND で選択する:
+    "file"  (デフォルト) : ローカルのJSONファイル
+    "redis"             : REDIS_URL のRedis（複数ワーカー・コンテナ間で共有、要 redis パッケージ）
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# キャッシュファイルの保存先（.gitignore対象）
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses")
+DEFAULT_TTL = 3600  # 1時間
+# 有効期限のばらつき（TTLの最大10%延長）。同時に保存したエントリが一斉に期限切れになるのを防ぐ
+TTL_JITTER = 0.1
+# 期限切れエントリの掃除間隔（秒）。キーは日付やパラメータごとに増えるため、読まれないキーも定期的に削除する
+SWEEP_INTERVAL = 600
+
+
+def make_key(url: str, params: Optional[Dict] = None) -> str:
+    """URLとパラメータ（順不同）からキャッシュキーを生成"""
+    raw = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """キャッシュバックエンドの共通インターフェース（get_entry / set を実装する）"""
+
+    # 取得中のキーのロック（イベントループごと）。同じキーの同時ミスで上流へ重複リクエストしない
+    _fetch_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        """有効期限内のエントリを (有効期限のUNIX時刻, データ) で返す。なければNone"""
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[Any]:
+        """有効期限内のデータを返す。なければNone"""
+        entry = await self.get_entry(key)
+        return entry[1] if entry else None
+
+    async def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        raise NotImplementedError
+
+    @classmethod
+    def _fetch_lock(cls, key: str) -> asyncio.Lock:
+        locks = cls._fetch_locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None) -> Any:
+        """キャッシュがあれば返し、なければ fetch() の結果を保存して返す（同じキーの取得は1回にまとめる）"""
+        data = await self.get(key)
+        if data is not None:
+            return data
+
+        async with self._fetch_lock(key):
+            # 待機中に他のタスクが取得済みならそれを返す
+            data = await self.get(key)
+            if data is not None:
+                return data
+            data = await fetch()
+            if data is not None:
+                if ttl is not None:
+                    ttl = ttl * (1 + random.uniform(0, TTL_JITTER))
+                await self.set(key, data, ttl)
+        return data
+
+
+class MemoryCache(CacheBackend):
+    """プロセス内の辞書によるTTL付きキャッシュ"""
+
+    def __init__(self, default_ttl: int = DEFAULT_TTL):
+        self.default_ttl = default_ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._next_sweep = time.time() + SWEEP_INTERVAL
+
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry[0]:
+            del self._entries[key]
+            return None
+        return entry
+
+    def put(self, key: str, expires: float, data: Any):
+        """有効期限（UNIX時刻）を指定して保存（SWEEP_INTERVAL 秒ごとに期限切れのエントリを削除する）"""
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + SWEEP_INTERVAL
+            for old_key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                del self._entries[old_key]
+        self._entries[key] = (expires, data)
+
+    async def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.put(key, time.time() + ttl, data)
+
+
+class TieredCache(CacheBackend):
+    """メモリキャッシュ → バックエンド（ファイル/Redis）の2段キャッシュ"""
+
+    def __init__(self, backend: CacheBackend):
+        self.memory = MemoryCache()
+        self.backend = backend
+
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = await self.memory.get_entry(key)
+        if entry is None:
+            entry = await self.backend.get_entry(key)
+            if entry is not None:
+                # バックエンドの有効期限のままメモリに載せる
+                self.memory.put(key, *entry)
+        return entry
+
+    async def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        await self.memory.set(key, data, ttl)
+        await self.backend.set(key, data, ttl)
+
+    async def warm(self) -> int:
+        """ファイルキャッシュの有効なエントリをメモリに読み込む（起動直後のミスを減らす。ファイルの読み込みはスレッドで行う）"""
+        if not isinstance(self.backend, FileCache):
+            return 0
+        entries = await asyncio.to_thread(self.backend.load_entries)
+        for key, (expires, data) in entries.items():
+            self.memory.put(key, expires, data)
+        return len(entries)
+
+
+class FileCache(CacheBackend):
+    """
+    JSONファイルによるTTL付きキャッシュ（1キー1ファイル）
+
+    ファイルの読み書きはスレッドで行い、イベントループ上の他のリクエストを止めない。
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, default_ttl: int = DEFAULT_TTL):
+        self.directory = directory
+        self.default_ttl = default_ttl
+        self._next_sweep = time.time() + SWEEP_INTERVAL
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _write(self, key: str, payload: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(key), "wb") as f:
+            f.write(payload)
+
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = await asyncio.to_thread(self._read, key)
+        if not isinstance(entry, dict):
+            return None
+
+        expires = entry.get("expires", 0)
+        if time.time() >= expires or entry.get("data") is None:
+            return None
+        return expires, entry["data"]
+
+    def load_entries(self) -> Dict[str, Tuple[float, Any]]:
+        """保存済みの有効なエントリを全て読み込む（期限切れのファイルは削除する）"""
+        entries: Dict[str, Tuple[float, Any]] = {}
+        now = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    entry = orjson.loads(f.read())
+                if now >= entry.get("expires", 0) or entry.get("data") is None:
+                    os.remove(path)
+                    continue
+            except (OSError, orjson.JSONDecodeError, AttributeError):
+                continue
+            entries[name[:-len(".json")]] = (entry["expires"], entry["data"])
+        return entries
+
+    async def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        """データを保存（失敗しても処理は継続）"""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        try:
+            payload = orjson.dumps({"ts": now, "expires": now + ttl, "data": data})
+            await asyncio.to_thread(self._write, key, payload)
+        except (OSError, TypeError) as e:
+            logger.warning("⚠️ キャッシュ保存失敗 (%s): %s", key, e)
+
+        # 読まれなくなったキーのファイルも SWEEP_INTERVAL 秒ごとに削除する（load_entries が期限切れを削除する）
+        if now >= self._next_sweep:
+            self._next_sweep = now + SWEEP_INTERVAL
+            await asyncio.to_thread(self.load_entries)
+
+
+class RedisCache(CacheBackend):
+    """RedisによるTTL付きキャッシュ（FileCacheと同じインターフェース）"""
+
+    KEY_PREFIX = "btc_bunseki:"
+
+    def __init__(self, url: str, default_ttl: int = DEFAULT_TTL):
+        import redis.asyncio  # 任意依存のため使用時にのみ読み込む
+
+        self._redis_module = redis.asyncio
+        self.url = url
+        self.default_ttl = default_ttl
+        # Redisクライアントはイベントループに紐づくため、ループごとに生成する
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._redis_module.Redis.from_url(self.url)
+            self._clients[loop] = client
+        return client
+
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            raw = await self._client().get(self.KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning("⚠️ Redisキャッシュ取得失敗 (%s): %s", key, e)
+            return None
+        if raw is None:
+            return None
+        # FileCacheと同じ {"expires", "data"} 形式で保存している（壊れた値はミスとして扱う）
+        try:
+            entry = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(entry, dict) or entry.get("data") is None:
+            return None
+        return entry.get("expires", time.time()), entry["data"]
+
+    async def set(self, key: str, data: Any, ttl: Optional[int] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            payload = orjson.dumps({"expires": time.time() + ttl, "data": data})
+            await self._client().setex(self.KEY_PREFIX + key, max(int(ttl), 1), payload)
+        except Exception as e:
+            logger.warning("⚠️ Redisキャッシュ保存失敗 (%s): %s", key, e)
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """プロセス共通のキャッシュインスタンスを取得（メモリ + CACHE_BACKENDで選択したバックエンド）"""
+    global _cache
+    if _cache is None:
+        backend: Optional[CacheBackend] = None
+        if os.environ.get("CACHE_BACKEND", "file").lower() == "redis":
+            try:
+                backend = RedisCache(os.environ["REDIS_URL"])
+                logger.info("🗄️ キャッシュ: Redis")
+            except (ImportError, KeyError) as e:
+                logger.warning("⚠️ Redisキャッシュを使用できません（ファイルキャッシュで代用）: %r", e)
+        _cache = TieredCache(backend or FileCache())
+    return _cache
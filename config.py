@@ -32,6 +32,18 @@ ETF_GIST_URL = os.environ.get("ETF_GIST_URL", "")
 # BTC ETFのシンボルリスト
 ETF_SYMBOLS = ["IBIT", "FBTC", "GBTC", "ARKB", "BITB"]
 
+# --- APIレスポンスのキャッシュ有効期限 (秒) ---
+# データの更新頻度に合わせて設定（FREDは週次/日次、Yahooは日足の終値）
+CACHE_TTL_FRED = 6 * 3600        # 6時間
+CACHE_TTL_YAHOO = 30 * 60        # 30分
+CACHE_TTL_BTC_PRICE = 20         # 20秒（現在価格として表示するため短め）
+CACHE_TTL_FEAR_GREED = 3600      # 1時間
+CACHE_TTL_FUNDING_RATE = 5 * 60  # 5分
+# /api/data の取得結果（同一期間内のポーリングは上流へのリクエストを共有する）
+CACHE_TTL_API_DATA = 60          # 1分
+# 期限切れ後もこの秒数までは古い結果を即座に返し、裏で再取得する（BTC価格のみ都度更新）
+CACHE_STALE_API_DATA = 10 * 60   # 10分
+
 
 # ============================================
 # レポート・ダッシュボードのシグナル閾値
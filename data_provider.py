@@ -7,71 +7,180 @@ v2: 過去データ取得の信頼性を向上
 """
 
 import asyncio
+import logging
+import random
+import time
+import weakref
 import aiohttp
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-
+import orjson
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+from typing import Optional, List, Dict, Any, Tuple
+
+import cache
 import config
 
+logger = logging.getLogger(__name__)
+
+
+class _Thousands:
+    """ログ出力時にだけ桁区切り（例: 7,012,345）で整形する数値ラッパー"""
+    __slots__ = ("value",)
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"{self.value:,.0f}"
+
+
 class DataProviderError(Exception):
     """データ取得に関するカスタムエラー"""
     pass
 
-async def _request_handler(session: aiohttp.ClientSession, url: str, params: Dict = None, headers: Dict = None) -> Dict:
-    """共通の非同期リクエストハンドラ"""
-    final_headers = {"User-Agent": config.USER_AGENT}
-    if headers: final_headers.update(headers)
-    
+def install_uvloop() -> bool:
+    """
+    uvloopがインストールされていれば asyncio のイベントループとして使用する
+    （未インストール・Windows環境では標準ループのまま。プログラムの入口で1回呼ぶ）
+    """
     try:
-        async with session.get(url, params=params, headers=final_headers, timeout=20) as response:
-            if response.status == 429:
-                await asyncio.sleep(60)
-                async with session.get(url, params=params, headers=final_headers, timeout=20) as resp:
-                    resp.raise_for_status()
-                    return await resp.json(content_type=None)
-            response.raise_for_status()
-            return await response.json(content_type=None)
-    except Exception as e:
-        raise DataProviderError(f"リクエストエラー ({url}): {e}") from e
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+# 全リクエスト共通のヘッダー（読み取り専用として扱い、追加ヘッダーがある場合のみ複製する）
+_BASE_HEADERS = {"User-Agent": config.USER_AGENT}
+
+# 1リクエストのタイムアウト（全体20秒・接続5秒・受信間隔10秒）
+# リクエストごとに数値で指定すると total だけの ClientTimeout になり connect / sock_read が外れるため、ここで一括指定する
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5, sock_read=10)
+
+# リトライ設定（429・接続エラー・タイムアウト時）
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0   # 秒
+BACKOFF_CAP = 30.0   # 秒
+
+# ホストごとの同時リクエスト数の上限（APIのレート制限に先回りして自己抑制する）
+DEFAULT_HOST_CONCURRENCY = 4
+HOST_CONCURRENCY: Dict[str, int] = {
+    # FREDは並列数を上げると429→リトライでかえって遅くなるため2本に絞る
+    "api.stlouisfed.org": 2,
+}
+
+# セマフォはイベントループに紐づくため、ループごとに保持する（asyncio.run の度にループが変わる）
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """URLのホストに対応するセマフォを取得（なければ作成）"""
+    host = urlparse(url).netloc
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+    return semaphores[host]
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """次の試行までの待機秒数。Retry-Afterがあれば優先し、なければ指数バックオフ+ジッター"""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), BACKOFF_CAP)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return min(max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0), BACKOFF_CAP)
+            except (TypeError, ValueError):
+                pass
+    # ジッターを加えてから上限を適用する（BACKOFF_CAP を超えない）
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt * (1 + random.random() * 0.5))
+
+
+async def _request_handler(session: aiohttp.ClientSession, url: str, params: Dict = None, headers: Dict = None, ttl: Optional[int] = None) -> Dict:
+    """
+    共通の非同期リクエストハンドラ（429・一時的な通信エラーはバックオフして再試行）
 
-async def get_fred_data(session: aiohttp.ClientSession, series_id: str, target_date: Optional[datetime] = None) -> Optional[float]:
-    """FREDからデータを取得。最新データを取得（直近30日間）"""
-    url = "https://api.stlouisfed.org/fred/series/observations"
+    ttl（秒）を指定すると、レスポンスをキャッシュし有効期限内はネットワークアクセスを省略する。
+    """
+    if ttl:
+        key = cache.make_key(url, params)
+        return await cache.get_cache().get_or_fetch(
+            key, lambda: _request_handler(session, url, params=params, headers=headers), ttl
+        )
+
+    final_headers = {**_BASE_HEADERS, **headers} if headers else _BASE_HEADERS
+
+    semaphore = _host_semaphore(url)
+    last_error: Any = None
+    for attempt in range(MAX_ATTEMPTS):
+        retry_after = None
+        try:
+            async with semaphore, session.get(url, params=params, headers=final_headers, timeout=REQUEST_TIMEOUT) as response:
+                if response.status == 429:
+                    last_error = "429 Too Many Requests"
+                    retry_after = response.headers.get("Retry-After")
+                else:
+                    response.raise_for_status()
+                    # バイト列のまま orjson でデコード（str への変換を挟まない）
+                    return orjson.loads(await response.read())
+        except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+            last_error = e
+        except Exception as e:
+            raise DataProviderError(f"リクエストエラー ({url}): {e}") from e
+
+        if attempt < MAX_ATTEMPTS - 1:
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
+
+    raise DataProviderError(f"リクエストエラー ({url}): {last_error} ({MAX_ATTEMPTS}回試行)")
+
+def _date_key(target_date: Optional[datetime] = None) -> str:
+    """基準日（省略時は今日）を "YYYY-MM-DD" で返す"""
+    return (target_date if target_date else datetime.now()).date().isoformat()
+
+@lru_cache(maxsize=8)
+def _fred_window(end_iso: str, days: int) -> Tuple[str, str]:
+    """
+    FREDの取得期間 (observation_start, observation_end) を日単位で返す
+
+    日付粒度に固定することで、同日中のリクエストパラメータ（=キャッシュキー）を一定に保つ。
+    """
+    end = date.fromisoformat(end_iso)
+    return (end - timedelta(days=days)).isoformat(), end_iso
 
+async def get_fred_data(session: aiohttp.ClientSession, series_id: str, target_date: Optional[datetime] = None) -> Optional[float]:
+    """FREDから最新値のみを取得（get_fred_data_with_change と同一リクエストを共有）"""
     # APIキー確認
     if not config.FRED_API_KEY or config.FRED_API_KEY == "YOUR_FRED_API_KEY_HERE":
-        print(f"⚠️ FRED APIキーが設定されていません (現在値: {config.FRED_API_KEY[:8] if config.FRED_API_KEY else 'None'}...)")
+        logger.warning("⚠️ FRED APIキーが設定されていません (現在値: %s...)", config.FRED_API_KEY[:8] if config.FRED_API_KEY else 'None')
         return None
 
-    # 最新データを取得（過去30日間で最新のものを取得）
-    end_date = target_date if target_date else datetime.now()
-    start_date = end_date - timedelta(days=30)
+    result = await get_fred_data_with_change(session, series_id, target_date)
+    if result:
+        return result["value"]
 
-    params = {
-        "series_id": series_id,
-        "api_key": config.FRED_API_KEY,
-        "file_type": "json",
-        "observation_start": start_date.strftime('%Y-%m-%d'),
-        "observation_end": end_date.strftime('%Y-%m-%d'),
-        "sort_order": "desc",
-        "limit": 1
-    }
+    logger.warning("⚠️ FRED取得失敗 (%s): データが見つかりませんでした。", series_id)
+    return None
 
-    try:
-        data = await _request_handler(session, url, params=params)
-        if data and data.get("observations") and len(data["observations"]) > 0:
-            value = data["observations"][0]["value"]
-            if value != ".":
-                print(f"📡 FRED ({series_id}): {float(value):,.0f}")
-                return float(value)
-    except DataProviderError as e:
-        print(f"⚠️ FRED取得失敗 ({series_id}): {e}")
 
-    print(f"⚠️ FRED取得失敗 ({series_id}): データが見つかりませんでした。")
-    return None
+async def get_fred_data_batch(session: aiohttp.ClientSession, series_ids: List[str], target_date: Optional[datetime] = None) -> Dict[str, Optional[Dict]]:
+    """
+    複数のFRED系列を並列取得
 
+    Returns:
+        {series_id: get_fred_data_with_change() の結果（失敗時はNone）}
+    """
+    results = await asyncio.gather(
+        *(get_fred_data_with_change(session, series_id, target_date) for series_id in series_ids),
+        return_exceptions=True,
+    )
+    return {
+        series_id: None if isinstance(result, Exception) else result
+        for series_id, result in zip(series_ids, results)
+    }
 
-async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: str) -> Optional[Dict]:
+
+async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: str, target_date: Optional[datetime] = None) -> Optional[Dict]:
     """
     FREDから最新データと前週比変化率を取得
     隠れQE判定用: 週次データの比較が必要
@@ -85,21 +194,20 @@ async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: s
         return None
 
     # 過去30日分のデータを取得（週次データなので4-5点取得できる）
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
+    observation_start, observation_end = _fred_window(_date_key(target_date), 30)
 
     params = {
         "series_id": series_id,
         "api_key": config.FRED_API_KEY,
         "file_type": "json",
-        "observation_start": start_date.strftime('%Y-%m-%d'),
-        "observation_end": end_date.strftime('%Y-%m-%d'),
+        "observation_start": observation_start,
+        "observation_end": observation_end,
         "sort_order": "desc",
         "limit": 5  # 直近5データポイントを取得
     }
 
     try:
-        data = await _request_handler(session, url, params=params)
+        data = await _request_handler(session, url, params=params, ttl=config.CACHE_TTL_FRED)
         observations = data.get("observations", [])
 
         # 有効な値のみ抽出
@@ -114,7 +222,7 @@ async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: s
             previous = valid_obs[1]["value"]
             change = ((current - previous) / previous * 100) if previous != 0 else 0
 
-            print(f"📡 FRED ({series_id}): {current:,.0f} (前週比: {change:+.2f}%)")
+            logger.info("📡 FRED (%s): %s (前週比: %+.2f%%)", series_id, _Thousands(current), change)
             return {
                 "value": current,
                 "prev_value": previous,
@@ -122,7 +230,7 @@ async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: s
                 "date": valid_obs[0]["date"]
             }
         elif len(valid_obs) == 1:
-            print(f"📡 FRED ({series_id}): {valid_obs[0]['value']:,.0f} (前週データなし)")
+            logger.info("📡 FRED (%s): %s (前週データなし)", series_id, _Thousands(valid_obs[0]['value']))
             return {
                 "value": valid_obs[0]["value"],
                 "prev_value": None,
@@ -130,7 +238,7 @@ async def get_fred_data_with_change(session: aiohttp.ClientSession, series_id: s
                 "date": valid_obs[0]["date"]
             }
     except DataProviderError as e:
-        print(f"⚠️ FRED取得失敗 ({series_id}): {e}")
+        logger.warning("⚠️ FRED取得失敗 (%s): %s", series_id, e)
 
     return None
 
@@ -160,20 +268,19 @@ async def get_fred_data_with_stats(session: aiohttp.ClientSession, series_id: st
         return None
 
     # 過去400日分のデータを取得（週次データなので約52週分）
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=400)
+    observation_start, observation_end = _fred_window(_date_key(), 400)
 
     params = {
         "series_id": series_id,
         "api_key": config.FRED_API_KEY,
         "file_type": "json",
-        "observation_start": start_date.strftime('%Y-%m-%d'),
-        "observation_end": end_date.strftime('%Y-%m-%d'),
+        "observation_start": observation_start,
+        "observation_end": observation_end,
         "sort_order": "desc",
     }
 
     try:
-        data = await _request_handler(session, url, params=params)
+        data = await _request_handler(session, url, params=params, ttl=config.CACHE_TTL_FRED)
         observations = data.get("observations", [])
 
         # 有効な値のみ抽出
@@ -197,7 +304,7 @@ async def get_fred_data_with_stats(session: aiohttp.ClientSession, series_id: st
         std_52w = statistics.stdev(values_52w) if len(values_52w) > 1 else 0
         zscore = (current - mean_52w) / std_52w if std_52w > 0 else 0
 
-        print(f"📡 FRED ({series_id}): {current:,.0f} (前週比: {change_pct:+.2f}%, z-score: {zscore:+.2f})")
+        logger.info("📡 FRED (%s): %s (前週比: %+.2f%%, z-score: %+.2f)", series_id, _Thousands(current), change_pct, zscore)
         return {
             "value": current,
             "prev_value": previous,
@@ -210,82 +317,85 @@ async def get_fred_data_with_stats(session: aiohttp.ClientSession, series_id: st
             "data_points": len(values_52w)
         }
     except DataProviderError as e:
-        print(f"⚠️ FRED取得失敗 ({series_id}): {e}")
+        logger.warning("⚠️ FRED取得失敗 (%s): %s", series_id, e)
     except Exception as e:
-        print(f"⚠️ FRED統計計算失敗 ({series_id}): {e}")
+        logger.warning("⚠️ FRED統計計算失敗 (%s): %s", series_id, e)
 
     return None
 
+def _extract_closes(payload: Optional[Dict]) -> List[float]:
+    """Yahoo Financeのchartレスポンスから終値（欠損を除く）を取り出す"""
+    try:
+        closes = payload["chart"]["result"][0]["indicators"]["quote"][0]["close"]
+        return [c for c in closes if c is not None]
+    except (KeyError, IndexError, TypeError):
+        return []
+
 async def get_btc_price(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Dict:
     """Yahoo FinanceからBTC価格と変化率を取得"""
     try:
         # 5日分のデータを取得して変化率を計算
         url = "https://query1.finance.yahoo.com/v8/finance/chart/BTC-USD"
         params = {"interval": "1d", "range": "5d"}
-        headers = {"User-Agent": config.USER_AGENT}
+        data = await _request_handler(session, url, params=params, ttl=config.CACHE_TTL_BTC_PRICE)
 
-        async with aiohttp.ClientSession() as temp_session:
-            async with temp_session.get(url, params=params, headers=headers, timeout=20) as response:
-                if response.status != 200:
-                    return {}
-                data = await response.json()
-
-        closes = data.get("chart", {}).get("result", [{}])[0].get("indicators", {}).get("quote", [{}])[0].get("close", [])
-        closes = [c for c in closes if c is not None]
+        closes = _extract_closes(data)
 
         if closes:
             change = ((closes[-1] - closes[0]) / closes[0] * 100) if len(closes) > 1 else 0
             return {"usd": closes[-1], "jpy": None, "change": change}
         return {}
     except Exception as e:
-        print(f"⚠️ BTC価格取得失敗: {e}")
+        logger.warning("⚠️ BTC価格取得失敗: %s", e)
         return {}
 
 async def get_fear_greed_index(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Optional[int]:
     """Alternative.meからF&G指数を取得。過去データはAPIが不安定なため最新値で代用。"""
     try:
         if target_date and (datetime.now().date() != target_date.date()):
-            print("⚠️ F&Gの過去データはAPI信頼性のため最新値で代用します。")
+            logger.warning("⚠️ F&Gの過去データはAPI信頼性のため最新値で代用します。")
         
         url = "https://api.alternative.me/fng/?limit=1"
-        data = await _request_handler(session, url)
+        data = await _request_handler(session, url, ttl=config.CACHE_TTL_FEAR_GREED)
         return int(data["data"][0]["value"])
     except (DataProviderError, KeyError, IndexError, ValueError) as e:
-        print(f"⚠️ F&G指数取得失敗: {e}")
+        logger.warning("⚠️ F&G指数取得失敗: %s", e)
         return None
 
 async def _get_yahoo_finance_data(session: aiohttp.ClientSession, symbol: str, target_date: Optional[datetime] = None):
-    """Yahoo Financeからデータを取得する共通関数（休日考慮）"""
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-    for i in range(5):
-        date_to_fetch = (target_date if target_date else datetime.now()) - timedelta(days=i)
-        
-        # 履歴取得にはperiod1とperiod2が必要
-        period1 = int((date_to_fetch - timedelta(days=1)).timestamp())
-        period2 = int(date_to_fetch.timestamp())
-        params = {"period1": period1, "period2": period2, "interval": "1d"}
+    """
+    Yahoo Financeからデータを取得する共通関数（休日考慮）
 
+    休日・週末をまたいでも直近の取引日が含まれるよう、14日分の日足を1回のリクエストで取得する。
+    """
+    if not target_date:
+        data = await _get_yahoo_finance_range(session, symbol, 14)
+    else:
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+        params = {
+            "period1": int((target_date - timedelta(days=14)).timestamp()),
+            "period2": int(target_date.timestamp()),
+            "interval": "1d",
+        }
         try:
             data = await _request_handler(session, url, params=params)
-            if data and data.get("chart", {}).get("result", [{}])[0].get("timestamp"):
-                return data
         except DataProviderError:
-            continue
-    return None
+            return None
+    return data if _extract_closes(data) else None
 
 async def get_dxy(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Optional[Dict]:
     try:
         data = await _get_yahoo_finance_data(session, "DX-Y.NYB", target_date)
         if not data: return None
 
-        indicators = data.get("chart", {}).get("result", [{}])[0].get("indicators", {}).get("quote", [{}])[0]
-        closes = [c for c in indicators.get("close", []) if c is not None]
+        # 直近2取引日の終値で前日比を計算
+        closes = _extract_closes(data)[-2:]
 
         if not closes: return None
         change = ((closes[-1] - closes[0]) / closes[0] * 100) if len(closes) > 1 else 0
         return {"value": closes[-1], "change": change}
     except (KeyError, IndexError) as e:
-        print(f"⚠️ DXY取得失敗: {e}")
+        logger.warning("⚠️ DXY取得失敗: %s", e)
         return None
 
 
@@ -301,8 +411,7 @@ async def get_usdjpy(session: aiohttp.ClientSession, target_date: Optional[datet
         if not data:
             return None
 
-        indicators = data.get("chart", {}).get("result", [{}])[0].get("indicators", {}).get("quote", [{}])[0]
-        closes = [c for c in indicators.get("close", []) if c is not None]
+        closes = _extract_closes(data)
 
         if not closes:
             return None
@@ -311,25 +420,56 @@ async def get_usdjpy(session: aiohttp.ClientSession, target_date: Optional[datet
         current = closes[-1]
         change = ((closes[-1] - closes[0]) / closes[0] * 100) if len(closes) > 1 else 0
 
-        print(f"📡 USDJPY: {current:.2f} (週次変化: {change:+.2f}%)")
+        logger.info("📡 USDJPY: %.2f (週次変化: %+.2f%%)", current, change)
         return {"value": current, "change": change}
     except (KeyError, IndexError) as e:
-        print(f"⚠️ USDJPY取得失敗: {e}")
+        logger.warning("⚠️ USDJPY取得失敗: %s", e)
         return None
 
 async def _get_yahoo_finance_range(session: aiohttp.ClientSession, symbol: str, days: int = 5):
     """Yahoo Financeから指定日数分のデータを取得"""
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
     params = {"interval": "1d", "range": f"{days}d"}
-    headers = {"User-Agent": config.USER_AGENT}
     try:
-        async with session.get(url, params=params, headers=headers, timeout=20) as response:
-            if response.status == 200:
-                return await response.json()
-    except Exception as e:
-        print(f"⚠️ Yahoo Finance取得失敗 ({symbol}): {e}")
+        return await _request_handler(session, url, params=params, ttl=config.CACHE_TTL_YAHOO)
+    except DataProviderError as e:
+        logger.warning("⚠️ Yahoo Finance取得失敗 (%s): %s", symbol, e)
     return None
 
+async def get_yahoo_history(session: aiohttp.ClientSession, symbol: str, start_date: str, end_date: str, interval: str = "1wk", ttl: Optional[int] = None) -> Optional[Dict]:
+    """
+    Yahoo Financeから期間指定で終値の履歴を取得（yfinance不要）
+
+    Args:
+        symbol: ティッカー（例: "USDJPY=X"）
+        start_date / end_date: "YYYY-MM-DD"
+        interval: "1d" / "1wk" など
+        ttl: レスポンスのキャッシュ有効期限（秒、省略時はキャッシュしない）
+
+    Returns:
+        {"timestamps": [UNIX秒], "closes": [終値], "timezone": 取引所タイムゾーン名}
+    """
+    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    params = {
+        "period1": int(datetime.strptime(start_date, "%Y-%m-%d").timestamp()),
+        "period2": int(datetime.strptime(end_date, "%Y-%m-%d").timestamp()),
+        "interval": interval,
+        "events": "history",
+    }
+    try:
+        data = await _request_handler(session, url, params=params, ttl=ttl)
+        result = data["chart"]["result"][0]
+        closes = result["indicators"]["quote"][0]["close"]
+        timestamps, closes = zip(*[(t, c) for t, c in zip(result["timestamp"], closes) if c is not None])
+        return {
+            "timestamps": list(timestamps),
+            "closes": list(closes),
+            "timezone": result.get("meta", {}).get("exchangeTimezoneName", "UTC"),
+        }
+    except (DataProviderError, KeyError, IndexError, TypeError, ValueError) as e:
+        logger.warning("⚠️ Yahoo Finance履歴取得失敗 (%s): %s", symbol, e)
+        return None
+
 async def get_macro_data(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Dict:
     result = {}
     endpoints = {"gold": "GC=F", "sp500": "^GSPC", "vix": "^VIX"}
@@ -343,19 +483,18 @@ async def get_macro_data(session: aiohttp.ClientSession, target_date: Optional[d
     for key, res_data in res_map.items():
         if isinstance(res_data, Exception) or not res_data: continue
         try:
-            indicators = res_data.get("chart", {}).get("result", [{}])[0].get("indicators", {}).get("quote", [{}])[0]
-            closes = [c for c in indicators.get("close", []) if c is not None]
+            closes = _extract_closes(res_data)
             if not closes: continue
             result[key] = closes[-1]
             result[f"{key}_change"] = ((closes[-1] - closes[0]) / closes[0] * 100) if len(closes) > 1 else 0
         except (KeyError, IndexError) as e:
-            print(f"⚠️ マクロデータ解析失敗 ({key}): {e}")
+            logger.warning("⚠️ マクロデータ解析失敗 (%s): %s", key, e)
     return result
 
 # バックテスト非対応の関数
 async def get_exchange_flow(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Optional[Dict]:
     if target_date:
-        print("⚠️ 取引所フローの過去データは取得できません。")
+        logger.warning("⚠️ 取引所フローの過去データは取得できません。")
         return None
     # ... (実装は変更なし)
     try:
@@ -368,83 +507,191 @@ async def get_exchange_flow(session: aiohttp.ClientSession, target_date: Optiona
 
 async def get_funding_rate(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Optional[float]:
     if target_date:
-        print("⚠️ ファンディングレートの過去データは取得できません。")
+        logger.warning("⚠️ ファンディングレートの過去データは取得できません。")
         return None
 
     # OKX API
     try:
         url = "https://www.okx.com/api/v5/public/funding-rate"
         params = {"instId": "BTC-USDT-SWAP"}
-        data = await _request_handler(session, url, params=params)
+        data = await _request_handler(session, url, params=params, ttl=config.CACHE_TTL_FUNDING_RATE)
         if data and data.get("data"):
             rate = data["data"][0].get("fundingRate")
             if rate:
-                print(f"📡 Funding Rate (OKX): {float(rate) * 100:.4f}%")
+                logger.info("📡 Funding Rate (OKX): %.4f%%", float(rate) * 100)
                 return float(rate) * 100
     except Exception as e:
-        print(f"⚠️ OKX Funding Rate取得失敗: {e}")
+        logger.warning("⚠️ OKX Funding Rate取得失敗: %s", e)
 
     # フォールバック: dYdX (分散型、制限なし)
     try:
         url = "https://indexer.dydx.trade/v4/perpetualMarkets"
-        data = await _request_handler(session, url)
+        data = await _request_handler(session, url, ttl=config.CACHE_TTL_FUNDING_RATE)
         if data and data.get("markets", {}).get("BTC-USD"):
             rate = data["markets"]["BTC-USD"].get("nextFundingRate")
             if rate:
-                print(f"📡 Funding Rate (dYdX): {float(rate) * 100:.4f}%")
+                logger.info("📡 Funding Rate (dYdX): %.4f%%", float(rate) * 100)
                 return float(rate) * 100
     except Exception as e:
-        print(f"⚠️ dYdX Funding Rate取得失敗: {e}")
+        logger.warning("⚠️ dYdX Funding Rate取得失敗: %s", e)
 
     return None
 
-# ETFフローのキャッシュ（1時間有効）
-_etf_cache = {"data": None, "timestamp": None}
+# ETFフローのキャッシュ（共通キャッシュに保存。1時間有効）
+ETF_CACHE_KEY = "etf_flow_latest"
 ETF_CACHE_DURATION = 3600  # 1時間
+# 取得失敗時のフォールバック用に、最後に取得できたデータを長めに保持
+ETF_LAST_GOOD_KEY = "etf_flow_last_good"
+ETF_LAST_GOOD_DURATION = 7 * 24 * 3600  # 7日
 
 # GitHub GistのURL（公開Gist）
 ETF_GIST_URL = "https://gist.githubusercontent.com/{user}/{gist_id}/raw/etf_flow.json"
 
+# 同時呼び出しを1回の取得にまとめるためのロック（イベントループごとに保持）
+_etf_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
 
 async def get_etf_flow(session: aiohttp.ClientSession, target_date: Optional[datetime] = None) -> Optional[Dict]:
     """GitHub GistからETFフローデータを取得（GitHub Actionsで更新）"""
-    global _etf_cache
-
     if target_date:
-        print("⚠️ ETFフローの過去データは取得できません。")
+        logger.warning("⚠️ ETFフローの過去データは取得できません。")
         return None
 
-    # キャッシュチェック（1時間以内ならスキップ）
-    now = datetime.now()
-    if _etf_cache["data"] and _etf_cache["timestamp"]:
-        elapsed = (now - _etf_cache["timestamp"]).total_seconds()
-        if elapsed < ETF_CACHE_DURATION:
-            print(f"📡 ETFフロー（キャッシュ）: {_etf_cache['data'].get('total_daily_flow')}M USD")
-            return _etf_cache["data"]
+    response_cache = cache.get_cache()
+    lock = _etf_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
 
-    try:
-        # GistからJSONを取得
-        gist_url = config.ETF_GIST_URL if hasattr(config, 'ETF_GIST_URL') else None
-        if not gist_url:
-            print("⚠️ ETF_GIST_URLが設定されていません")
-            return None
+    async with lock:
+        # キャッシュチェック（1時間以内ならスキップ）
+        cached = await response_cache.get(ETF_CACHE_KEY)
+        if cached:
+            logger.info("📡 ETFフロー（キャッシュ）: %sM USD", cached.get('total_daily_flow'))
+            return cached
 
-        data = await _request_handler(session, gist_url)
-        if data and data.get("total_daily_flow") is not None:
-            _etf_cache["data"] = data
-            _etf_cache["timestamp"] = now
-            print(f"📡 ETFフロー取得成功: {data.get('date')} / Total: {data.get('total_daily_flow')}M USD")
-            return data
+        try:
+            # GistからJSONを取得
+            gist_url = config.ETF_GIST_URL if hasattr(config, 'ETF_GIST_URL') else None
+            if not gist_url:
+                logger.warning("⚠️ ETF_GIST_URLが設定されていません")
+                return None
+
+            data = await _request_handler(session, gist_url)
+            if data and data.get("total_daily_flow") is not None:
+                await response_cache.set(ETF_CACHE_KEY, data, ETF_CACHE_DURATION)
+                await response_cache.set(ETF_LAST_GOOD_KEY, data, ETF_LAST_GOOD_DURATION)
+                logger.info("📡 ETFフロー取得成功: %s / Total: %sM USD", data.get('date'), data.get('total_daily_flow'))
+                return data
 
-    except Exception as e:
-        print(f"⚠️ ETFフロー取得失敗: {e}")
-        # エラー時は古いキャッシュを返す
-        if _etf_cache["data"]:
-            print("↪️ 古いキャッシュを使用します")
-            return _etf_cache["data"]
+        except Exception as e:
+            logger.warning("⚠️ ETFフロー取得失敗: %s", e)
+            # エラー時は古いキャッシュを返す
+            stale = await response_cache.get(ETF_LAST_GOOD_KEY)
+            if stale:
+                logger.info("↪️ 古いキャッシュを使用します")
+                return stale
 
     return None
 
+# ダッシュボードで使用するFRED系列（最新値と前週比）
+DASHBOARD_FRED_SERIES = ["WALCL", "RRPONTSYD", "WTREGEN", "TREAST"]
+FETCH_ALL_TIMEOUT = 30  # 秒（全取得の上限。超過分は欠損扱い）
+# データごとの取得時間の上限（秒）。1つのAPIが遅くても他のデータは待たせない
+FETCH_TIMEOUTS = {
+    "btc": 10,
+    "fear_greed": 10,
+    "dxy": 10,
+    "usdjpy": 10,
+    "funding_rate": 15,  # OKX失敗時のdYdXフォールバックを含む
+    "exchange_flow": 15,
+    "macro": 15,
+    "etf_flow": 15,
+    "fred": 20,
+    "swpt": 20,
+}
+
+# 最新データ取得時の、データごとの前回成功した結果 {key: (取得時刻(monotonic), データ)}
+# 一時的な失敗では CACHE_STALE_API_DATA 秒以内の前回値で代用し、シグナルの欠損を防ぐ
+_last_success: Dict[str, Tuple[float, Any]] = {}
+
+def _is_failed(value: Any) -> bool:
+    """取得失敗を表す値か（None、空の辞書、値が全てNoneの辞書）"""
+    return value is None or (isinstance(value, dict) and all(v is None for v in value.values()))
+
+
+def _with_last_success(key: str, value: Any, now: float) -> Any:
+    """成功した値は記録して返し、失敗した値は CACHE_STALE_API_DATA 秒以内の前回値で代用する"""
+    if not _is_failed(value):
+        _last_success[key] = (now, value)
+        return value
+    last = _last_success.get(key)
+    if last is not None and now - last[0] < config.CACHE_STALE_API_DATA:
+        logger.info("♻️ %s: %.0f秒前の取得結果で代用します", key, now - last[0])
+        return last[1]
+    return value
+
+async def fetch_all(session: aiohttp.ClientSession, target_date: Optional[datetime] = None, timeout: float = FETCH_ALL_TIMEOUT) -> Dict[str, Any]:
+    """
+    ダッシュボード用の全データを並列取得
+
+    失敗したデータ、および FETCH_TIMEOUTS の秒数（全体では timeout 秒）以内に
+    完了しなかったデータは None とする（遅いAPIがあっても、取得できた分だけで結果を返す）。
+
+    Returns:
+        {"fred": {series_id: {...}}, "dxy", "exchange_flow", "macro", "btc",
+         "fear_greed", "funding_rate", "etf_flow", "swpt", "usdjpy"}
+    """
+    coros = {
+        "fred": get_fred_data_batch(session, DASHBOARD_FRED_SERIES, target_date),
+        "dxy": get_dxy(session, target_date),
+        "exchange_flow": get_exchange_flow(session, target_date),
+        "macro": get_macro_data(session, target_date),
+        "btc": get_btc_price(session, target_date),
+        "fear_greed": get_fear_greed_index(session, target_date),
+        "funding_rate": get_funding_rate(session, target_date),
+        "etf_flow": get_etf_flow(session, target_date),
+        # 隠れQE判定用データ
+        "swpt": get_fred_data_with_stats(session, "SWPT"),  # Central Bank Swaps（統計付き）
+        "usdjpy": get_usdjpy(session, target_date),
+    }
+    tasks = {
+        key: asyncio.ensure_future(asyncio.wait_for(coro, min(FETCH_TIMEOUTS.get(key, timeout), timeout)))
+        for key, coro in coros.items()
+    }
+    _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    now = time.monotonic()
+    results = {}
+    for key, task in tasks.items():
+        if task in pending:
+            logger.warning("⚠️ %s: %s秒以内に取得できませんでした", key, timeout)
+            results[key] = None
+        elif isinstance(task.exception(), asyncio.TimeoutError):
+            logger.warning("⚠️ %s: %s秒以内に取得できませんでした", key, FETCH_TIMEOUTS.get(key, timeout))
+            results[key] = None
+        elif task.exception() is not None:
+            logger.warning("⚠️ %s: 取得失敗 (%s)", key, task.exception())
+            results[key] = None
+        else:
+            results[key] = task.result()
+
+        # 過去データ（バックテスト）では前回値で代用しない
+        if target_date is not None:
+            continue
+        if key == "fred":
+            # FREDは系列ごとに成否が分かれるため、系列単位で前回値を補う
+            fred = results[key] or dict.fromkeys(DASHBOARD_FRED_SERIES)
+            merged = {
+                series_id: _with_last_success(f"fred:{series_id}", value, now)
+                for series_id, value in fred.items()
+            }
+            if not _is_failed(merged):
+                results[key] = merged
+        else:
+            results[key] = _with_last_success(key, results[key], now)
+    return results
+
 # --- 同期関数 (変更なし) ---
 def calculate_liquidity(balance_sheet: List[Dict], rrp: List[Dict], tga: List[Dict]) -> List[Dict]:
     # ...
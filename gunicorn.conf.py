@@ -0,0 +1,12 @@
+"""
+gunicorn の設定（gunicorn は起動ディレクトリの gunicorn.conf.py を自動で読み込む）
+
+ワーカーの起動後にデータの先読み・定期更新を開始する。
+先読みは常駐スレッドで行うため、fork 前（--preload）ではなくワーカーごとに開始する。
+"""
+
+
+def post_worker_init(worker):
+    import server
+
+    server.start_background_refresh()
@@ -3,11 +3,172 @@ GitHub Actions用 ETFスクレイピングスクリプト
 毎日1回実行し、結果をGistに保存する
 """
 
-import json
 import os
 import re
+import time
+import orjson
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 行パース用の正規表現（行ごとに再解決しないようモジュール読み込み時にコンパイル）
+DATE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+# "+183.54" や "-65.80" や "1.13K" などにマッチ（"1." のような末尾ドットは含めない）
+NUM_RE = re.compile(r'[+-]?\d+(?:\.\d+)?K?')
+
+# フローテーブルの日付行が描画されたかを判定するJS（固定sleepの代わりにポーリングする）
+FLOW_ROWS_READY_JS = """
+return Array.from(document.querySelectorAll('table tr'))
+    .some(row => /^\\s*\\d{4}-\\d{2}-\\d{2}/.test(row.innerText || ''));
+"""
+
+def wait_for_flow_rows(sb, timeout=20, interval=0.5):
+    """日付行が表示されるまで待機（表示されたら即座に戻る）"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if sb.execute_script(FLOW_ROWS_READY_JS):
+            return True
+        sb.sleep(interval)
+    return False
+
+# ETF名の順序（CoinGlassの表示順）
+ETF_NAMES = ['GBTC', 'IBIT', 'FBTC', 'ARKB', 'BITB', 'BTCO', 'HODL', 'BRRR', 'EZBC', 'BTCW']
+
+def parse_value(val_str):
+    """"+183.54" / "-65.80" / "1.13K" 形式の文字列を数値に変換（失敗時は0）"""
+    try:
+        val_str = val_str.replace('+', '')
+        if 'K' in val_str.upper():
+            return float(val_str.upper().replace('K', '')) * 1000
+        return float(val_str)
+    except:
+        return 0
+
+def _extract_row(text, etf_names=ETF_NAMES):
+    """
+    フローテーブルの1行からETFフローを抽出
+
+    Returns:
+        {"total_daily_flow", "date", "top_flows", "updated_at"}、有効なデータがない行はNone
+    """
+    print(f"Flow row: {text[:120]}...")
+
+    # 日付を抽出（最初の10文字 YYYY-MM-DD）
+    date_match = DATE_RE.match(text)
+    if not date_match:
+        return None
+    date_str = date_match.group(1)
+
+    # "-" が多い行はスキップ（データなしの行）
+    # "- " または " -" のパターンをカウント
+    dash_count = text.count(' - ') + text.count('- ') + text.count(' -\n')
+    print(f"Dash count (no data indicators): {dash_count}")
+    if dash_count >= 3:
+        print(f"Too many no-data indicators ({dash_count}), skipping...")
+        return None
+
+    # 日付以降のテキストから数値を抽出（+付き、-付き、K付きを含む）
+    numbers = [parse_value(n) for n in NUM_RE.findall(text[10:])]
+    print(f"Parsed numbers: {numbers[:15]}...")
+
+    if len(numbers) < 10:
+        print(f"Not enough numbers ({len(numbers)}), skipping...")
+        return None
+
+    # ユニークな非ゼロ値が2個未満の行はスキップ
+    # (同じ値が2回出るだけの行はパースエラーの可能性が高い)
+    non_zero_unique = set(n for n in numbers if n != 0)
+    if len(non_zero_unique) < 2:
+        print(f"Only {len(non_zero_unique)} unique non-zero values, likely bad data, skipping...")
+        return None
+
+    # ETF個別フロー + 合計
+    # CoinGlassの構造: [ETF1, ..., ETF10, その他, 日次合計]
+    # 最後の値が日次合計（トータル）
+    daily_total = numbers[-1]
+    etf_values = numbers[:-1][:10]  # 最初の10個がETF
+
+    etf_flows = []
+    for i, name in enumerate(etf_names):
+        if i < len(etf_values):
+            flow = etf_values[i]
+            if flow != 0:
+                etf_flows.append({"symbol": name, "daily_flow": flow})
+
+    print(f"Date: {date_str}, Daily total: {daily_total}, ETF flows: {etf_flows[:5]}")
+
+    return {
+        "total_daily_flow": daily_total,
+        "date": date_str,
+        "top_flows": sorted(etf_flows, key=lambda x: abs(x["daily_flow"]), reverse=True)[:5],
+        "updated_at": datetime.now().isoformat()
+    }
+
+# WebDriver の要素テキストで改行区切りになるブロック要素と、テキストに含まれない要素
+BLOCK_TAGS = frozenset({'div', 'p', 'br', 'li', 'ul', 'ol', 'table', 'tr', 'section', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+HIDDEN_TAGS = frozenset({'script', 'style', 'template', 'noscript', '-comment'})
+
+def _is_hidden(node):
+    style = (node.attributes.get('style') or '').replace(' ', '').lower()
+    return 'hidden' in node.attributes or 'display:none' in style or 'visibility:hidden' in style
+
+def _collect_text(node, parts):
+    """表示されるテキストを parts に追加（ブロック要素の前後は改行で区切る）"""
+    for child in node.iter(include_text=True):
+        if child.tag == '-text':
+            parts.append(child.text_content or '')
+        elif child.tag in HIDDEN_TAGS or _is_hidden(child):
+            continue
+        elif child.tag in BLOCK_TAGS:
+            parts.append('\n')
+            _collect_text(child, parts)
+            parts.append('\n')
+        else:
+            _collect_text(child, parts)
+
+def _cell_text(cell):
+    """
+    セルのテキストを WebDriver の element.text と同じ形式で取得
+
+    インライン要素（"1.13<span>K</span>" など）は連結し、ブロック要素は改行で区切る
+    （"+183.5" と "41.2%" が別のdivにある場合に "+183.541.2%" と連結されないようにする）。
+    非表示の要素は含めず、各行の連続する空白は1つにまとめる。
+    """
+    parts = []
+    _collect_text(cell, parts)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+def get_table_row_texts(sb):
+    """
+    描画済みページの全テーブル行のテキストを取得
+
+    ページのHTMLを1回だけ取得して selectolax で解析する（行ごとのWebDriver呼び出しを避ける）。
+    selectolax がない環境では WebDriver 経由で取得する。
+    """
+    try:
+        import selectolax.lexbor  # noqa: F401
+    except ImportError:
+        texts = []
+        for row in sb.find_elements('css selector', 'table tr'):
+            try:
+                texts.append(row.text or "")
+            except:
+                continue
+        return texts
+
+    return parse_table_row_texts(sb.get_page_source())
+
+def parse_table_row_texts(html):
+    """ページのHTMLから全テーブル行のテキストを取得（セル同士は空白で区切る。WebDriverの row.text と同じ形式）"""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    return [
+        ' '.join(_cell_text(cell) for cell in row.css('th, td'))
+        for row in tree.css('table tr')
+    ]
 
 def scrape_etf_flow():
     """SeleniumBaseでCoinGlassからETFフローをスクレイピング"""
@@ -17,33 +178,26 @@ def scrape_etf_flow():
         with SB(uc=True, headless=True) as sb:
             print("Opening CoinGlass page...")
             sb.open('https://www.coinglass.com/ja/etf/bitcoin')
-            sb.sleep(8)
+            sb.wait_for_element('table', timeout=30)
 
             # ページ下部にスクロールしてフローテーブルを表示
             print("Scrolling to find flow table...")
             sb.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-            sb.sleep(3)
             sb.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            sb.sleep(5)
-
-            # ページのHTMLを取得してデバッグ
-            page_text = sb.get_page_source()
+            if not wait_for_flow_rows(sb):
+                print("Flow rows did not appear within timeout")
 
-            # 全ての行を取得
-            all_rows = sb.find_elements('css selector', 'table tr')
+            # 全ての行のテキストを取得
+            all_rows = get_table_row_texts(sb)
             print(f"Found {len(all_rows)} total table rows")
 
             # フローデータを含む行を探す（日付形式の行）
             flow_rows = []
-            for row in all_rows:
-                try:
-                    text = row.text if row.text else ""
-                    # 日付パターン(YYYY-MM-DD)で始まる行を探す
-                    if text and ('2026-' in text[:15] or '2025-' in text[:15]):
-                        print(f"Found date row: {text[:80]}...")
-                        flow_rows.append(row)
-                except:
-                    continue
+            for text in all_rows:
+                # 日付パターン(YYYY-MM-DD)で始まる行を探す
+                if text and ('2026-' in text[:15] or '2025-' in text[:15]):
+                    print(f"Found date row: {text[:80]}...")
+                    flow_rows.append(text)
 
             print(f"Found {len(flow_rows)} flow data rows")
 
@@ -51,79 +205,11 @@ def scrape_etf_flow():
                 print("No flow rows found")
                 return None
 
-            # ETF名の順序（CoinGlassの表示順）
-            etf_names = ['GBTC', 'IBIT', 'FBTC', 'ARKB', 'BITB', 'BTCO', 'HODL', 'BRRR', 'EZBC', 'BTCW']
-
             # 有効なデータがある行を探す
             for row in flow_rows[:15]:
-                text = row.text.strip() if hasattr(row, 'text') else str(row)
-                print(f"Flow row: {text[:120]}...")
-
-                # 日付を抽出（最初の10文字 YYYY-MM-DD）
-                date_match = re.match(r'^(\d{4}-\d{2}-\d{2})', text)
-                if not date_match:
-                    continue
-                date_str = date_match.group(1)
-
-                # "-" が多い行はスキップ（データなしの行）
-                # "- " または " -" のパターンをカウント
-                dash_count = text.count(' - ') + text.count('- ') + text.count(' -\n')
-                print(f"Dash count (no data indicators): {dash_count}")
-                if dash_count >= 3:
-                    print(f"Too many no-data indicators ({dash_count}), skipping...")
-                    continue
-
-                # 日付以降のテキストから数値を抽出
-                text_after_date = text[10:]
-
-                # 数値を抽出（+付き、-付き、K付きを含む）
-                # "+183.54" や "-65.80" や "1.13K" などにマッチ
-                raw_numbers = re.findall(r'[+-]?\d+\.?\d*K?', text_after_date)
-
-                def parse_value(val_str):
-                    try:
-                        val_str = val_str.replace('+', '')
-                        if 'K' in val_str.upper():
-                            return float(val_str.upper().replace('K', '')) * 1000
-                        return float(val_str)
-                    except:
-                        return 0
-
-                numbers = [parse_value(n) for n in raw_numbers]
-                print(f"Parsed numbers: {numbers[:15]}...")
-
-                if len(numbers) < 10:
-                    print(f"Not enough numbers ({len(numbers)}), skipping...")
-                    continue
-
-                # ユニークな非ゼロ値が2個未満の行はスキップ
-                # (同じ値が2回出るだけの行はパースエラーの可能性が高い)
-                non_zero_unique = set(n for n in numbers if n != 0)
-                if len(non_zero_unique) < 2:
-                    print(f"Only {len(non_zero_unique)} unique non-zero values, likely bad data, skipping...")
-                    continue
-
-                # ETF個別フロー + 合計
-                # CoinGlassの構造: [ETF1, ..., ETF10, その他, 日次合計]
-                # 最後の値が日次合計（トータル）
-                daily_total = numbers[-1]
-                etf_values = numbers[:-1][:10]  # 最初の10個がETF
-
-                etf_flows = []
-                for i, name in enumerate(etf_names):
-                    if i < len(etf_values):
-                        flow = etf_values[i]
-                        if flow != 0:
-                            etf_flows.append({"symbol": name, "daily_flow": flow})
-
-                print(f"Date: {date_str}, Daily total: {daily_total}, ETF flows: {etf_flows[:5]}")
-
-                return {
-                    "total_daily_flow": daily_total,
-                    "date": date_str,
-                    "top_flows": sorted(etf_flows, key=lambda x: abs(x["daily_flow"]), reverse=True)[:5],
-                    "updated_at": datetime.now().isoformat()
-                }
+                result = _extract_row(row.strip())
+                if result:
+                    return result
 
             print("No valid data row found")
             return None
@@ -135,6 +221,23 @@ def scrape_etf_flow():
         return None
 
 
+# GitHub API用のセッション（keep-alive + 429/5xx時の自動リトライ）
+# Gistの更新は同じ内容での再送が安全なため、PATCHもリトライ対象に含める
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "PATCH"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ),
+))
+
+
 def update_gist(data):
     """GitHub Gistを更新"""
     gist_id = os.environ.get('GIST_ID')
@@ -146,21 +249,23 @@ def update_gist(data):
 
     headers = {
         'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
+        'Accept': 'application/vnd.github.v3+json',
+        'Content-Type': 'application/json'
     }
 
     payload = {
         'files': {
             'etf_flow.json': {
-                'content': json.dumps(data, ensure_ascii=False, indent=2)
+                'content': orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
             }
         }
     }
 
-    response = requests.patch(
+    response = _SESSION.patch(
         f'https://api.github.com/gists/{gist_id}',
         headers=headers,
-        json=payload
+        data=orjson.dumps(payload),
+        timeout=30
     )
 
     if response.status_code == 200:
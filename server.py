@@ -6,48 +6,380 @@ BTCシグナルダッシュボード用 バックエンドサーバー
 
 import asyncio
 import aiohttp
-import json
+import atexit
+import gzip
+import hashlib
+import logging
+import logging.handlers
+import operator
+import orjson
+import os
+import queue
+import threading
+import time
 from flask import Flask, jsonify, render_template, request
-from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 
 # 共通モジュールからインポート
+import cache
 import data_provider
 import config
 
+logger = logging.getLogger(__name__)
+
+
+def _setup_logging():
+    """
+    ログ出力の設定（本番では LOG_LEVEL=WARNING で成功ログを抑制できる）
+
+    ログはキューに積むだけにして、標準出力への書き込みは別スレッドで行う
+    （出力先が詰まってもリクエスト処理を待たせない）。
+    """
+    root = logging.getLogger()
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    if root.handlers:
+        return  # 既に設定済み（gunicorn等）
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+_setup_logging()
+
+# 利用可能なら高速なイベントループ（uvloop）を使用
+if data_provider.install_uvloop():
+    logger.info("⚡ uvloop を使用します")
+
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify の直列化に orjson を使用する（UTF-8のまま出力、intキーの辞書にも対応）"""
+
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS), mimetype=self.mimetype
+        )
+
+
 # Flaskアプリケーションの初期化
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CACHE_FILE = "latest_successful_data.json"
 
-# 起動時のデバッグログ
-print(f"🔑 FRED_API_KEY: {'設定済み (' + config.FRED_API_KEY[:4] + '...)' if config.FRED_API_KEY and config.FRED_API_KEY != 'YOUR_FRED_API_KEY_HERE' else '未設定'}")
-print(f"🔑 ETF_GIST_URL: {'設定済み' if config.ETF_GIST_URL else '未設定'}")
+# 起動時のデバッグログ（DEBUGレベルが無効なら文字列の組み立ても行わない）
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(
+        "🔑 FRED_API_KEY: %s",
+        f"設定済み ({config.FRED_API_KEY[:4]}...)"
+        if config.FRED_API_KEY and config.FRED_API_KEY != 'YOUR_FRED_API_KEY_HERE' else "未設定",
+    )
+    logger.debug("🔑 ETF_GIST_URL: %s", "設定済み" if config.ETF_GIST_URL else "未設定")
+
+
+# 失敗が続いているエンドポイント（連続失敗中はトレースバックを出さず1行のログにする）
+_failing = set()
+# エンドポイントごとの最後にトレースバックを出力した時刻（monotonic）
+_last_traceback: dict = {}
+TRACEBACK_INTERVAL = 300  # 秒（同じエンドポイントのトレースバックはこの間隔に1回まで）
+
+
+def log_failure(key, message, *args):
+    """
+    エンドポイントのエラーをログ出力
+
+    トレースバックは連続失敗の最初の1回だけ、かつ TRACEBACK_INTERVAL 秒に1回まで出力し
+    （デバッグ時は毎回）、上流の障害中にポーリングのたびにスタックトレースを整形しないようにする。
+    成功したら log_recovered(key) で連続失敗の状態を解除する。
+    """
+    now = time.monotonic()
+    first = key not in _failing
+    _failing.add(key)
+    if app.debug or (first and now - _last_traceback.get(key, float("-inf")) >= TRACEBACK_INTERVAL):
+        _last_traceback[key] = now
+        logger.exception(message, *args)
+    else:
+        logger.error(message, *args)
+
+
+def log_recovered(key):
+    """連続失敗の状態を解除（次の失敗ではトレースバックを出力する）"""
+    _failing.discard(key)
+
+
+# =============================================================================
+# 共有イベントループ・HTTPセッション
+# リクエストごとに asyncio.run + ClientSession を作り直すとTCP/TLSハンドシェイクが毎回発生するため、
+# 常駐スレッドのイベントループ上で1つのセッション（接続プール・DNSキャッシュ）を使い回す
+# =============================================================================
+_loop: "asyncio.AbstractEventLoop | None" = None
+_loop_lock = threading.Lock()
+SESSION: "aiohttp.ClientSession | None" = None
+
+
+def _get_loop():
+    """常駐イベントループを取得（初回呼び出し時にスレッドを起動）"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            # Python 3.12以降: キャッシュヒット等で即座に完了するタスクはスケジューラを経由せずに実行する
+            if hasattr(asyncio, "eager_task_factory"):
+                _loop.set_task_factory(asyncio.eager_task_factory)
+            threading.Thread(target=_loop.run_forever, name="aiohttp-loop", daemon=True).start()
+    return _loop
+
+
+# リクエストスレッドがイベントループの結果を待つ上限（秒）。fetch_all の全体タイムアウトより長くする
+FETCH_RESULT_TIMEOUT = data_provider.FETCH_ALL_TIMEOUT + 15
+
+
+def run_async(coro, timeout=None):
+    """コルーチンを常駐イベントループで実行し、結果を同期的に返す（timeout 秒を超えたら中断する）"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        # Python 3.10 では concurrent.futures.TimeoutError は組み込みの TimeoutError と別クラス
+        future.cancel()
+        raise
+
+
+def get_session():
+    """共有セッションを取得（常駐ループ上でのみ呼び出すため排他は不要）"""
+    global SESSION
+    if SESSION is None or SESSION.closed:
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30, enable_cleanup_closed=True)
+        SESSION = aiohttp.ClientSession(connector=connector, timeout=data_provider.REQUEST_TIMEOUT)
+    return SESSION
+
+
+@atexit.register
+def _close_session():
+    """終了時に共有セッションを閉じる"""
+    if SESSION is not None and not SESSION.closed and _loop is not None and _loop.is_running():
+        try:
+            run_async(SESSION.close(), timeout=5)
+        except Exception:
+            pass
+
+
+# fetch_all_data が返すリストの並び（get_data ではこの順に展開する）
+RESULT_FIELDS = (
+    "balance_sheet", "rrp", "tga", "dxy", "exchange_flow", "macro", "btc",
+    "fear_greed", "funding_rate", "etf_flow", "walcl_weekly", "swpt", "treast", "usdjpy",
+)
+BTC_INDEX = RESULT_FIELDS.index("btc")
 
 
 async def fetch_all_data():
-    """全データを非同期で並列取得"""
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            data_provider.get_fred_data(session, "WALCL"),
-            data_provider.get_fred_data(session, "RRPONTSYD"),
-            data_provider.get_fred_data(session, "WTREGEN"),
-            data_provider.get_dxy(session),
-            data_provider.get_exchange_flow(session),
-            data_provider.get_macro_data(session),
-            data_provider.get_btc_price(session),
-            data_provider.get_fear_greed_index(session),
-            data_provider.get_funding_rate(session),
-            data_provider.get_etf_flow(session),
-            # 隠れQE判定用データ（週次変化率付き）
-            data_provider.get_fred_data_with_change(session, "WALCL"),   # Total Assets
-            data_provider.get_fred_data_with_stats(session, "SWPT"),     # Central Bank Swaps（統計付き）
-            data_provider.get_fred_data_with_change(session, "TREAST"),  # Treasury Holdings
-            data_provider.get_usdjpy(session),                           # USDJPY
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-    return results
+    """全データを非同期で並列取得（全プロバイダで共有セッション・接続プールを使用）"""
+    data = await data_provider.fetch_all(get_session())
+
+    fred = data["fred"] or {}
+
+    def latest_value(series_id):
+        series = fred.get(series_id)
+        return series["value"] if series else None
+
+    return [
+        latest_value("WALCL"), latest_value("RRPONTSYD"), latest_value("WTREGEN"),
+        data["dxy"], data["exchange_flow"], data["macro"], data["btc"],
+        data["fear_greed"], data["funding_rate"], data["etf_flow"],
+        fred.get("WALCL"),   # Total Assets（週次変化率付き）
+        data["swpt"],        # Central Bank Swaps（統計付き）
+        fred.get("TREAST"),  # Treasury Holdings（週次変化率付き）
+        data["usdjpy"],
+    ]
+
+
+# 取得結果のキャッシュ（TTL内の同時・連続リクエストは1回のファンアウトを共有する）
+_data_cache = {"ts": float("-inf"), "data": None}  # ts: 取得時刻（monotonic）。起動直後でも期限切れとして扱う
+_data_lock: "asyncio.Lock | None" = None
+_refresh_task: "asyncio.Task | None" = None
+# 最後に /api/data が呼ばれた時刻（アクセスがない間はバックグラウンド更新を止める）
+_last_request = float("-inf")
+WARM_IDLE_LIMIT = 10 * 60  # 秒
+
+
+async def _refresh_data():
+    """全データを取得してキャッシュを更新（同時に1つだけ実行）"""
+    global _data_lock
+    if _data_lock is None:
+        _data_lock = asyncio.Lock()  # 常駐ループ上で生成する
+    started = time.monotonic()
+    async with _data_lock:
+        # 待機中に他のリクエストが取得済みならそれを返す
+        if _data_cache["ts"] >= started:
+            return _data_cache["data"]
+
+        results = await fetch_all_data()
+        # BTC価格が取れなかった結果はキャッシュしない（次のリクエストで再取得する）
+        btc = results[BTC_INDEX]
+        if btc and btc.get("usd"):
+            _data_cache.update(ts=time.monotonic(), data=results)
+        return results
+
+
+# 直近に BTC価格を差し替えた結果 (元の結果, BTC価格, 差し替え後の結果)
+# 元の結果とBTC価格が同じなら同一オブジェクトを返し、/api/data の計算済みレスポンスを使い回せるようにする
+_fresh_btc_results = (None, None, None)
+
+
+async def _with_fresh_btc(results):
+    """キャッシュ済みの結果のBTC価格だけを最新にする（BTC価格は短いTTLでキャッシュされている）"""
+    global _fresh_btc_results
+    try:
+        btc = await asyncio.wait_for(
+            data_provider.get_btc_price(get_session()), data_provider.FETCH_TIMEOUTS["btc"]
+        )
+    except Exception:
+        btc = None
+    if not btc or not btc.get("usd"):
+        return results
+
+    base, last_btc, fresh = _fresh_btc_results
+    if base is results and last_btc == btc:
+        return fresh
+    fresh = list(results)
+    fresh[BTC_INDEX] = btc
+    _fresh_btc_results = (results, btc, fresh)
+    return fresh
+
+
+async def get_all_data():
+    """
+    fetch_all_data() の結果をキャッシュ付きで返す
+
+    - CACHE_TTL_API_DATA 秒以内: キャッシュをそのまま返す
+    - CACHE_STALE_API_DATA 秒以内: BTC価格のみ最新にして即座に返し、残りはバックグラウンドで更新
+    - それ以外: 取得完了を待つ（同時リクエストは1回の取得結果を共有）
+    """
+    global _refresh_task
+    age = time.monotonic() - _data_cache["ts"]
+    if age < config.CACHE_TTL_API_DATA:
+        return _data_cache["data"]
+
+    if _data_cache["data"] is not None and age < config.CACHE_STALE_API_DATA:
+        if _refresh_task is None or _refresh_task.done():
+            _refresh_task = asyncio.create_task(_refresh_data())
+        return await _with_fresh_btc(_data_cache["data"])
 
+    return await _refresh_data()
 
-def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data):
+
+async def _prewarm():
+    """起動直後にキャッシュを温めておく（初回リクエストの待ち時間を短縮）"""
+    try:
+        # 前回までにディスクへ保存した有効なレスポンスをメモリに載せてから取得する
+        loaded = await cache.get_cache().warm()
+        if loaded:
+            logger.info("🗄️ ディスクキャッシュから%d件を読み込みました", loaded)
+        await get_all_data()
+        logger.info("🔥 /api/data: キャッシュのプリウォーム完了")
+    except Exception as e:
+        logger.warning("⚠️ /api/data: プリウォーム失敗: %s", e)
+
+
+async def _warmer():
+    """
+    キャッシュが期限切れになる少し前にバックグラウンドで再取得する
+    （利用者のリクエストが上流APIの待ち時間を負担しないように）
+
+    直近 WARM_IDLE_LIMIT 秒以内に /api/data へのアクセスがあった場合のみ更新する。
+    """
+    interval = max(config.CACHE_TTL_API_DATA - 10, 5)
+    while True:
+        await asyncio.sleep(interval)
+        if time.monotonic() - _last_request > WARM_IDLE_LIMIT:
+            continue
+        try:
+            await _refresh_data()
+        except Exception as e:
+            logger.warning("⚠️ /api/data: バックグラウンド更新失敗: %s", e)
+
+
+# 隠れQE判定の閾値情報（フロントエンド表示用、設定値から1回だけ生成）
+HIDDEN_QE_THRESHOLDS = {
+    "total_assets": f"> +{config.TOTAL_ASSETS_INCREASE_THRESHOLD}%",
+    "treasury": f"< +{config.TREASURY_HOLDINGS_INCREASE_THRESHOLD}%",
+    "swaps": f"週次% >= {config.SWAPS_SURGE_THRESHOLD_PCT}% & 増加額 >= {config.SWAPS_SURGE_THRESHOLD_ABS}B | z-score >= {config.SWAPS_SURGE_ZSCORE_THRESHOLD}",
+    "usdjpy": f"円安 >= +{config.USDJPY_WEAKENING_THRESHOLD}% | (>={config.USDJPY_HIGH_LEVEL} & ボラ >= {config.USDJPY_HIGH_VOLATILITY}%)"
+}
+
+# 隠れQE判定の各条件の詳細情報の初期値（データ取得失敗時の表示）
+HIDDEN_QE_DETAILS_DEFAULT = {
+    "total_assets": {
+        "status": "データ取得失敗",
+        "value": None,
+        "change": None,
+        "threshold": config.TOTAL_ASSETS_INCREASE_THRESHOLD,
+        "met": False,
+        "reason": "FREDからデータを取得できませんでした",
+        "indicators": ["週次%"]
+    },
+    "treasury": {
+        "status": "データ取得失敗",
+        "value": None,
+        "change": None,
+        "threshold": config.TREASURY_HOLDINGS_INCREASE_THRESHOLD,
+        "met": False,
+        "reason": "FREDからデータを取得できませんでした",
+        "indicators": ["週次%"]
+    },
+    "swaps": {
+        "status": "データ取得失敗",
+        "value": None,
+        "change": None,
+        "threshold": config.SWAPS_SURGE_THRESHOLD_PCT,
+        "met": False,
+        "reason": "FREDからデータを取得できませんでした",
+        "indicators": ["週次%", "増加額", "z-score"]
+    },
+    "usdjpy": {
+        "status": "データ取得失敗",
+        "value": None,
+        "change": None,
+        "threshold": config.USDJPY_WEAKENING_THRESHOLD,
+        "met": False,
+        "reason": "Yahoo Financeからデータを取得できませんでした",
+        "indicators": ["週次%", "水準", "ボラ"]
+    },
+}
+
+
+# 表示用の更新時刻（分単位）の (分, 文字列)。同じ分の間は strftime を呼ばずに再利用する
+_minute_timestamp_cache = (None, "")
+
+
+def minute_timestamp():
+    """現在時刻を "YYYY-MM-DD HH:MM UTC" で返す（分が変わるまでは前回の文字列を返す）"""
+    global _minute_timestamp_cache
+    minute = int(time.time() // 60)
+    cached_minute, text = _minute_timestamp_cache
+    if minute != cached_minute:
+        text = datetime.fromtimestamp(minute * 60, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        _minute_timestamp_cache = (minute, text)
+    return text
+
+
+def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data, updated_at=None):
     """
     隠れQE（日本経由）シグナルを計算（精度向上版 v2）
 
@@ -72,55 +404,24 @@ def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data):
     - 0-1条件成立: OFF（シグナルなし）
     """
     score = 0
-    updated_at = datetime.now().strftime("%Y-%m-%d %H:%M UTC")
-
-    # 閾値情報（フロントエンド表示用）
-    thresholds = {
-        "total_assets": f"> +{config.TOTAL_ASSETS_INCREASE_THRESHOLD}%",
-        "treasury": f"< +{config.TREASURY_HOLDINGS_INCREASE_THRESHOLD}%",
-        "swaps": f"週次% >= {config.SWAPS_SURGE_THRESHOLD_PCT}% & 増加額 >= {config.SWAPS_SURGE_THRESHOLD_ABS}B | z-score >= {config.SWAPS_SURGE_ZSCORE_THRESHOLD}",
-        "usdjpy": f"円安 >= +{config.USDJPY_WEAKENING_THRESHOLD}% | (>={config.USDJPY_HIGH_LEVEL} & ボラ >= {config.USDJPY_HIGH_VOLATILITY}%)"
-    }
-
-    # 各条件の詳細情報を初期化
-    details = {
-        "total_assets": {
-            "status": "データ取得失敗",
-            "value": None,
-            "change": None,
-            "threshold": config.TOTAL_ASSETS_INCREASE_THRESHOLD,
-            "met": False,
-            "reason": "FREDからデータを取得できませんでした",
-            "indicators": ["週次%"]
-        },
-        "treasury": {
-            "status": "データ取得失敗",
-            "value": None,
-            "change": None,
-            "threshold": config.TREASURY_HOLDINGS_INCREASE_THRESHOLD,
-            "met": False,
-            "reason": "FREDからデータを取得できませんでした",
-            "indicators": ["週次%"]
-        },
-        "swaps": {
-            "status": "データ取得失敗",
-            "value": None,
-            "change": None,
-            "threshold": config.SWAPS_SURGE_THRESHOLD_PCT,
-            "met": False,
-            "reason": "FREDからデータを取得できませんでした",
-            "indicators": ["週次%", "増加額", "z-score"]
-        },
-        "usdjpy": {
-            "status": "データ取得失敗",
-            "value": None,
-            "change": None,
-            "threshold": config.USDJPY_WEAKENING_THRESHOLD,
-            "met": False,
-            "reason": "Yahoo Financeからデータを取得できませんでした",
-            "indicators": ["週次%", "水準", "ボラ"]
-        },
-    }
+    if updated_at is None:
+        updated_at = minute_timestamp()
+
+    # 閾値情報と各条件の初期値（取得失敗時の表示）は設定値から生成済みの定数を使用する
+    # （条件ごとのエントリは下で丸ごと差し替えるだけで、中身は変更しない）
+    thresholds = HIDDEN_QE_THRESHOLDS
+    details = dict(HIDDEN_QE_DETAILS_DEFAULT)
+
+    # 全データの取得に失敗した場合（障害時）は、判定を行わずに初期値のまま返す
+    if not (walcl_data or swpt_data or treast_data or usdjpy_data):
+        return {
+            "signal": "OFF",
+            "score": 0,
+            "details": details,
+            "explanation": "0/4条件のみ成立。現時点で隠れQEの明確な兆候なし。",
+            "thresholds": thresholds,
+            "updated_at": updated_at
+        }
 
     # =========================================
     # 条件1: Total Assets（WALCL）が前週比で増加
@@ -260,23 +561,26 @@ def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data):
         change = usdjpy_data["change"]
         value = usdjpy_data["value"]
         volatility = abs(change)  # ボラティリティ = 変化率の絶対値
+        weakening_threshold = config.USDJPY_WEAKENING_THRESHOLD
+        high_level = config.USDJPY_HIGH_LEVEL
+        high_volatility = config.USDJPY_HIGH_VOLATILITY
 
         # 複合判定
         met = False
         met_reason = ""
 
         # 条件A: 円安進行
-        if change >= config.USDJPY_WEAKENING_THRESHOLD:
+        if change >= weakening_threshold:
             met = True
-            met_reason = f"円安進行: 週次 {change:+.2f}% >= {config.USDJPY_WEAKENING_THRESHOLD}%"
+            met_reason = f"円安進行: 週次 {change:+.2f}% >= {weakening_threshold}%"
             status = "円安進行"
         # 条件B: 高水準 & 高ボラ（介入警戒局面）
-        elif value >= config.USDJPY_HIGH_LEVEL and volatility >= config.USDJPY_HIGH_VOLATILITY:
+        elif value >= high_level and volatility >= high_volatility:
             met = True
-            met_reason = f"介入警戒: {value:.1f} >= {config.USDJPY_HIGH_LEVEL} & ボラ {volatility:.2f}% >= {config.USDJPY_HIGH_VOLATILITY}%"
+            met_reason = f"介入警戒: {value:.1f} >= {high_level} & ボラ {volatility:.2f}% >= {high_volatility}%"
             status = "介入警戒"
         else:
-            if change <= -config.USDJPY_WEAKENING_THRESHOLD:
+            if change <= -weakening_threshold:
                 met_reason = f"円高進行: 週次 {change:+.2f}%"
                 status = "円高進行"
             else:
@@ -291,9 +595,9 @@ def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data):
             "value": value,
             "change": change,
             "volatility": volatility,
-            "threshold": config.USDJPY_WEAKENING_THRESHOLD,
-            "threshold_level": config.USDJPY_HIGH_LEVEL,
-            "threshold_volatility": config.USDJPY_HIGH_VOLATILITY,
+            "threshold": weakening_threshold,
+            "threshold_level": high_level,
+            "threshold_volatility": high_volatility,
             "met": met,
             "reason": met_reason,
             "indicators": ["週次%", "水準", "ボラ"]
@@ -323,53 +627,176 @@ def calculate_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data):
     }
 
 
+# 前回の隠れQE計算の (入力データ, 結果)
+_hidden_qe_result = ((), None)
+
+
+def cached_hidden_qe_signal(walcl_data, swpt_data, treast_data, usdjpy_data, updated_at=None):
+    """
+    calculate_hidden_qe_signal の結果を入力データごとに再利用する
+
+    取得結果は週次/日次更新のため、BTC価格だけの更新やscore_mode違いのリクエストでは
+    入力が前回と同じオブジェクトのままになる。その場合は再計算せず前回の結果
+    （updated_at も前回計算時のもの）を返す。
+    """
+    global _hidden_qe_result
+    inputs = (walcl_data, swpt_data, treast_data, usdjpy_data)
+    last_inputs, last_result = _hidden_qe_result
+    if len(last_inputs) == len(inputs) and all(a is b for a, b in zip(last_inputs, inputs)):
+        return last_result
+    result = calculate_hidden_qe_signal(*inputs, updated_at=updated_at)
+    _hidden_qe_result = (inputs, result)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _rendered_page(template_name):
+    """テンプレートを1回だけ描画し、(HTMLのバイト列, ETag) を返す（ページはリクエストに依存しない）"""
+    html = render_template(template_name).encode("utf-8")
+    return html, hashlib.md5(html).hexdigest()
+
+
+def render_page(template_name):
+    """描画済みのページをETag付きで返す（If-None-Match が一致すれば304）"""
+    if app.debug:
+        # 開発時はテンプレートの変更をすぐ反映する
+        return render_template(template_name)
+    html, etag = _rendered_page(template_name)
+    response = app.response_class(html, mimetype="text/html")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, max-age=60"
+    return response.make_conditional(request)
+
+
 @app.route('/')
 def dashboard():
     """ダッシュボードのHTMLページを配信する"""
-    return render_template('dashboard_pro.html')
+    return render_page('dashboard_pro.html')
 
 
 @app.route('/liquidity')
 def liquidity_page():
     """USD流動性チャートページを配信する"""
-    return render_template('liquidity.html')
+    return render_page('liquidity.html')
+
+
+# =============================================================================
+# FRED履歴データ（流動性チャート用）
+# 週次更新のデータのため、同じ系列・期間の取得結果は CACHE_TTL_FRED の間使い回す
+# （取得は常駐イベントループの共有セッションで行う）
+# =============================================================================
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+_fred_history_cache: dict = {}
+_fred_history_lock = threading.Lock()
+
+
+async def _fetch_fred_observations(series_id, start, end):
+    """FREDの系列を共有セッションで取得し [{"date", "value"}, ...] で返す（失敗時はNone）"""
+    params = {
+        "series_id": series_id,
+        "api_key": config.FRED_API_KEY,
+        "file_type": "json",
+        "observation_start": start,
+        "observation_end": end,
+    }
+    try:
+        data = await data_provider._request_handler(
+            get_session(), FRED_OBSERVATIONS_URL, params=params, ttl=config.CACHE_TTL_FRED
+        )
+        return [
+            {"date": obs["date"], "value": float(obs["value"])}
+            for obs in data.get("observations", [])
+            if obs["value"] != "."
+        ]
+    except Exception as e:
+        logger.warning("⚠️ FRED履歴取得エラー (%s): %s", series_id, e)
+        return None
 
 
-@app.route('/api/liquidity-history')
-def get_liquidity_history():
-    """過去1年分のFRED流動性データを取得"""
-    import requests
+def fetch_fred_history(series_ids, start, end):
+    """
+    複数のFRED系列を {series_id: [{"date", "value"}, ...]} で取得（失敗した系列は空リスト）
+
+    start / end は "YYYY-MM-DD"。成功した結果は (系列, 期間) ごとにキャッシュし、
+    キャッシュにない系列だけを常駐イベントループで並列取得する。
+    """
+    now = time.monotonic()
+    history = {}
+    with _fred_history_lock:
+        for series_id in series_ids:
+            entry = _fred_history_cache.get((series_id, start, end))
+            if entry and now < entry[0]:
+                history[series_id] = entry[1]
+    missing = [series_id for series_id in series_ids if series_id not in history]
+    if not missing:
+        return history
+
+    async def fetch_missing():
+        return await asyncio.gather(*(_fetch_fred_observations(sid, start, end) for sid in missing))
+
+    try:
+        fetched = run_async(fetch_missing(), timeout=FETCH_RESULT_TIMEOUT)
+    except FutureTimeoutError:
+        logger.warning("⚠️ FRED履歴取得: %s秒以内に完了しませんでした (%s)", FETCH_RESULT_TIMEOUT, ", ".join(missing))
+        fetched = [None] * len(missing)
+    except Exception as e:
+        logger.warning("⚠️ FRED履歴取得エラー (%s): %s", ", ".join(missing), e)
+        fetched = [None] * len(missing)
+    with _fred_history_lock:
+        # 期限切れのエントリ（前日以前の期間など）を掃除してから保存
+        for key in [key for key, (expires, _) in _fred_history_cache.items() if expires <= now]:
+            del _fred_history_cache[key]
+        for series_id, observations in zip(missing, fetched):
+            if observations is not None:
+                _fred_history_cache[(series_id, start, end)] = (now + config.CACHE_TTL_FRED, observations)
+            history[series_id] = observations or []
+    return history
+
+
+# 履歴エンドポイントのJSONバイト列（ルートごとに (系列リストのタプル, JSONバイト列)）
+# 系列がキャッシュから返された同一オブジェクトであれば、直列化を省略して同じバイト列を返す
+_history_bodies: dict = {}
+
+
+def history_response(name, payload):
+    """履歴データ {キー: 系列リスト} のJSONレスポンスを作成（系列が前回と同じなら再エンコードしない）"""
+    series = tuple(payload.values())
+    cached = _history_bodies.get(name)
+    if cached is not None and len(cached[0]) == len(series) and all(
+        a is b for a, b in zip(cached[0], series)
+    ):
+        body = cached[1]
+    else:
+        body = orjson.dumps(payload)
+        _history_bodies[name] = (series, body)
+    return json_response(body)
+
+
+def _history_period(days=365):
+    """過去 days 日分の期間を ("YYYY-MM-DD", "YYYY-MM-DD") で返す"""
     from datetime import timedelta
 
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=365)
-
-    def fetch_fred_series(series_id):
-        url = "https://api.stlouisfed.org/fred/series/observations"
-        params = {
-            "series_id": series_id,
-            "api_key": config.FRED_API_KEY,
-            "file_type": "json",
-            "observation_start": start_date.strftime('%Y-%m-%d'),
-            "observation_end": end_date.strftime('%Y-%m-%d'),
-        }
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                return [
-                    {"date": obs["date"], "value": float(obs["value"])}
-                    for obs in data.get("observations", [])
-                    if obs["value"] != "."
-                ]
-        except Exception as e:
-            print(f"FRED履歴取得エラー ({series_id}): {e}")
-        return []
+    start_date = end_date - timedelta(days=days)
+    return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+
+def _exchange_dates(history):
+    """get_yahoo_history の結果の各時刻を取引所タイムゾーンの日付 "YYYY-MM-DD" に変換"""
+    tz = ZoneInfo(history["timezone"])
+    return [datetime.fromtimestamp(ts, tz).strftime('%Y-%m-%d') for ts in history["timestamps"]]
 
-    return jsonify({
-        "walcl": fetch_fred_series("WALCL"),
-        "rrp": fetch_fred_series("RRPONTSYD"),
-        "tga": fetch_fred_series("WTREGEN"),
+
+@app.route('/api/liquidity-history')
+def get_liquidity_history():
+    """過去1年分のFRED流動性データを取得"""
+    start, end = _history_period()
+    history = fetch_fred_history(("WALCL", "RRPONTSYD", "WTREGEN"), start, end)
+
+    return history_response("liquidity", {
+        "walcl": history["WALCL"],
+        "rrp": history["RRPONTSYD"],
+        "tga": history["WTREGEN"],
     })
 
 
@@ -384,51 +811,38 @@ def get_foreign_liquidity_history():
     - WALCL: Total Assets（FRB総資産）
     - TREAST: Treasury Holdings（国債保有、国内QE指標）
     """
-    import requests
-    from datetime import timedelta
-
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=365)
-
-    def fetch_fred_series(series_id):
-        url = "https://api.stlouisfed.org/fred/series/observations"
-        params = {
-            "series_id": series_id,
-            "api_key": config.FRED_API_KEY,
-            "file_type": "json",
-            "observation_start": start_date.strftime('%Y-%m-%d'),
-            "observation_end": end_date.strftime('%Y-%m-%d'),
-        }
-        try:
-            resp = requests.get(url, params=params, timeout=30)
-            if resp.status_code == 200:
-                data = resp.json()
-                return [
-                    {"date": obs["date"], "value": float(obs["value"])}
-                    for obs in data.get("observations", [])
-                    if obs["value"] != "."
-                ]
-        except Exception as e:
-            print(f"FRED履歴取得エラー ({series_id}): {e}")
-        return []
+    start, end = _history_period()
+    history = fetch_fred_history(("SWPT", "WALCL", "TREAST"), start, end)
 
-    return jsonify({
-        "swpt": fetch_fred_series("SWPT"),       # Central Bank Swaps
-        "walcl": fetch_fred_series("WALCL"),     # Total Assets
-        "treast": fetch_fred_series("TREAST"),   # Treasury Holdings
+    return history_response("foreign_liquidity", {
+        "swpt": history["SWPT"],       # Central Bank Swaps
+        "walcl": history["WALCL"],     # Total Assets
+        "treast": history["TREAST"],   # Treasury Holdings
     })
 
 
 @app.route('/foreign-liquidity')
 def foreign_liquidity_page():
     """海外向け流動性（隠れQE）チャートページを配信する"""
-    return render_template('foreign_liquidity.html')
+    return render_page('foreign_liquidity.html')
 
 
 @app.route('/arthur-scenario')
 def arthur_scenario_page():
     """Arthur Hayes Scenario可視化ページを配信する"""
-    return render_template('arthur_scenario.html')
+    return render_page('arthur_scenario.html')
+
+
+# 週次シグナルがない場合の weekly_signals（列ごとの配列形式）
+EMPTY_WEEKLY_SIGNALS = {
+    "dates": [],
+    "signals": [],
+    "scores": [],
+    "conditions": {"total_assets": [], "treasury": [], "swaps": [], "usdjpy": []},
+}
+
+
+ARTHUR_MAX_YEARS = 10  # /api/arthur-scenario-history の years の上限
 
 
 @app.route('/api/arthur-scenario-history')
@@ -441,13 +855,14 @@ def get_arthur_scenario_history():
         - on_transitions: OFF→ON転換日（重要イベント）
         - weekly_signals: 週次シグナル履歴
     """
-    import requests
-    import statistics
+    import numpy as np
     from datetime import timedelta
+    from numpy.lib.stride_tricks import sliding_window_view
 
     # 常にJSONを返すためtry/exceptで全体をラップ
     try:
-        years = int(request.args.get('years', 3))
+        # 期間ごとに上流のキャッシュキーが増えるため、範囲を制限する
+        years = min(max(int(request.args.get('years', 3)), 1), ARTHUR_MAX_YEARS)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=years * 365)
 
@@ -457,195 +872,175 @@ def get_arthur_scenario_history():
                 "error": "FRED APIキーが未設定です。環境変数 FRED_API_KEY を設定してください。",
                 "on_transitions": [],
                 "btc_prices": [],
-                "weekly_signals": []
+                "weekly_signals": EMPTY_WEEKLY_SIGNALS
             })
 
-        def fetch_fred_series(series_id):
-            url = "https://api.stlouisfed.org/fred/series/observations"
-            params = {
-                "series_id": series_id,
-                "api_key": config.FRED_API_KEY,
-                "file_type": "json",
-                "observation_start": start_date.strftime('%Y-%m-%d'),
-                "observation_end": end_date.strftime('%Y-%m-%d'),
-            }
-            try:
-                resp = requests.get(url, params=params, timeout=30)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    result = {}
-                    for obs in data.get("observations", []):
-                        if obs["value"] != ".":
-                            result[obs["date"]] = float(obs["value"])
-                    return result
-            except Exception as e:
-                print(f"FRED履歴取得エラー ({series_id}): {e}")
-            return {}
-
-        # FREDデータ取得
-        walcl = fetch_fred_series("WALCL")
-        swpt = fetch_fred_series("SWPT")
-        treast = fetch_fred_series("TREAST")
+        # FREDデータ取得（3系列を並列取得し、{日付: 値} に変換）
+        history = fetch_fred_history(
+            ("WALCL", "SWPT", "TREAST"), start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        )
+        walcl, swpt, treast = (
+            {obs["date"]: obs["value"] for obs in history[series_id]}
+            for series_id in ("WALCL", "SWPT", "TREAST")
+        )
 
         if not walcl or not swpt:
             return jsonify({
                 "error": "FREDデータの取得に失敗しました。APIキーを確認してください。",
                 "on_transitions": [],
                 "btc_prices": [],
-                "weekly_signals": []
+                "weekly_signals": EMPTY_WEEKLY_SIGNALS
             })
 
-        # BTC価格履歴取得（Yahoo Finance）
+        # BTC価格（日足）とUSDJPY（週足）の履歴を Yahoo Finance から並列取得
+        start_str, end_str = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+        async def fetch_yahoo_histories():
+            session = get_session()
+            return await asyncio.gather(
+                data_provider.get_yahoo_history(
+                    session, "BTC-USD", start_str, end_str, interval="1d", ttl=config.CACHE_TTL_YAHOO
+                ),
+                data_provider.get_yahoo_history(
+                    session, "USDJPY=X", start_str, end_str, interval="1wk", ttl=config.CACHE_TTL_YAHOO
+                ),
+            )
+
+        btc_history, usdjpy_history = run_async(fetch_yahoo_histories(), timeout=FETCH_RESULT_TIMEOUT)
+
+        # BTC価格履歴
         btc_prices = []
         btc_error = None
-        try:
-            import yfinance as yf
-            print(f"yfinance version: {yf.__version__}")
-            btc = yf.Ticker("BTC-USD")
-            hist = btc.history(start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), interval="1d")
-            print(f"BTC履歴取得: {len(hist)}件")
-            for d, row in hist.iterrows():
-                try:
-                    # タイムゾーン対応: tz_localize(None)でnaiveに変換
-                    date_str = d.tz_localize(None).strftime('%Y-%m-%d') if d.tzinfo else d.strftime('%Y-%m-%d')
-                    btc_prices.append({"date": date_str, "price": float(row["Close"])})
-                except Exception as row_err:
-                    print(f"BTC行処理エラー: {row_err}")
-        except ImportError as ie:
-            btc_error = f"yfinanceがインストールされていません: {ie}"
-            print(f"BTC価格取得エラー (ImportError): {ie}")
-        except Exception as e:
-            btc_error = f"BTC価格取得失敗: {e}"
-            print(f"BTC価格取得エラー: {e}")
-            import traceback
-            traceback.print_exc()
+        if btc_history:
+            btc_prices = [
+                {"date": date_str, "price": float(close)}
+                for date_str, close in zip(_exchange_dates(btc_history), btc_history["closes"])
+            ]
+        else:
+            btc_error = "BTC価格履歴の取得に失敗しました（Yahoo Finance）"
 
-        # USDJPY履歴取得
+        # USDJPY履歴（週次変化率付き）
         usdjpy_data = {}
-        try:
-            import yfinance as yf
-            usdjpy = yf.Ticker("USDJPY=X")
-            hist = usdjpy.history(start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), interval="1wk")
-            prev_value = None
-            for d, row in hist.iterrows():
-                try:
-                    date_str = d.tz_localize(None).strftime('%Y-%m-%d') if d.tzinfo else d.strftime('%Y-%m-%d')
-                    value = float(row["Close"])
-                    change = ((value - prev_value) / prev_value * 100) if prev_value else 0
-                    usdjpy_data[date_str] = {"value": value, "change": change}
-                    prev_value = value
-                except Exception:
-                    pass
-        except Exception as e:
-            print(f"USDJPY取得エラー: {e}")
+        if usdjpy_history:
+            # 前週比（%）。先頭週・前週値が0の週は0とする
+            usdjpy_closes = np.array(usdjpy_history["closes"], dtype=float)
+            usdjpy_changes = np.zeros(len(usdjpy_closes))
+            prev_closes = usdjpy_closes[:-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                usdjpy_changes[1:] = np.where(
+                    prev_closes != 0, (usdjpy_closes[1:] - prev_closes) / prev_closes * 100, 0
+                )
+            usdjpy_data = {
+                date_str: {"value": value, "change": change}
+                for date_str, value, change in zip(
+                    _exchange_dates(usdjpy_history), usdjpy_closes.tolist(), usdjpy_changes.tolist()
+                )
+            }
 
         # 週次でシグナル判定
         dates = sorted(set(walcl.keys()) & set(swpt.keys()))
-        weekly_signals = []
         transitions = []  # score>=2 への転換日（WATCH以上）
         prev_score = 0  # 前週のスコアを追跡
 
-        # 52週分のデータでz-score計算用の統計を計算
-        swpt_values = [swpt[d] for d in sorted(swpt.keys())]
-
-        for i, date in enumerate(dates):
-            try:
-                # 前週比計算
-                prev_dates = [d for d in dates if d < date]
-                prev_date = prev_dates[-1] if prev_dates else None
-
-                walcl_change = ((walcl[date] - walcl[prev_date]) / walcl[prev_date] * 100) if prev_date and prev_date in walcl and walcl[prev_date] != 0 else None
-                swpt_change = ((swpt[date] - swpt[prev_date]) / swpt[prev_date] * 100) if prev_date and prev_date in swpt and swpt[prev_date] != 0 else None
-                swpt_change_abs = (swpt[date] - swpt[prev_date]) if prev_date and prev_date in swpt else None
-                treast_change = ((treast.get(date, 0) - treast.get(prev_date, 0)) / treast.get(prev_date, 1) * 100) if prev_date and treast.get(prev_date) else None
-
-                # z-score計算（直近52週）
-                swpt_recent = swpt_values[max(0, i-52):i+1]
-                if len(swpt_recent) >= 10:
-                    mean_52w = statistics.mean(swpt_recent)
-                    std_52w = statistics.stdev(swpt_recent) if len(swpt_recent) > 1 else 1
-                    zscore = (swpt[date] - mean_52w) / std_52w if std_52w > 0 else 0
-                else:
-                    zscore = 0
-
-                # 判定
-                score = 0
-                conditions = {"total_assets": False, "treasury": False, "swaps": False, "usdjpy": False}
-
-                # 条件1: Total Assets > +0.1%
-                if walcl_change is not None and walcl_change > config.TOTAL_ASSETS_INCREASE_THRESHOLD:
-                    score += 1
-                    conditions["total_assets"] = True
-
-                # 条件2: Treasury < +0.5%
-                if treast_change is not None and treast_change < config.TREASURY_HOLDINGS_INCREASE_THRESHOLD:
-                    score += 1
-                    conditions["treasury"] = True
-
-                # 条件3: Swaps急増
-                swpt_value_b = swpt[date] / 1000
-                swpt_change_abs_b = (swpt_change_abs / 1000) if swpt_change_abs else 0
-                if swpt_value_b >= config.SWAPS_MINIMUM_VALUE:
-                    if swpt_change and swpt_change >= config.SWAPS_SURGE_THRESHOLD_PCT and swpt_change_abs_b >= config.SWAPS_SURGE_THRESHOLD_ABS:
-                        score += 1
-                        conditions["swaps"] = True
-                if zscore >= config.SWAPS_SURGE_ZSCORE_THRESHOLD:
-                    if not conditions["swaps"]:
-                        score += 1
-                        conditions["swaps"] = True
-
-                # 条件4: USDJPY
-                usdjpy_entry = usdjpy_data.get(date) or {}
-                if usdjpy_entry:
-                    usdjpy_val = usdjpy_entry.get("value", 0)
-                    usdjpy_chg = usdjpy_entry.get("change", 0)
-                    if usdjpy_chg >= config.USDJPY_WEAKENING_THRESHOLD:
-                        score += 1
-                        conditions["usdjpy"] = True
-                    elif usdjpy_val >= config.USDJPY_HIGH_LEVEL and abs(usdjpy_chg) >= config.USDJPY_HIGH_VOLATILITY:
-                        score += 1
-                        conditions["usdjpy"] = True
-
-                # シグナル判定
-                if score >= config.HIDDEN_QE_SIGNAL_ON:
-                    signal = "ON"
-                elif score >= config.HIDDEN_QE_SIGNAL_WATCH:
-                    signal = "WATCH"
-                else:
-                    signal = "OFF"
-
-                weekly_signals.append({
+        # z-score計算用に、各週までの直近52週（最大53点）の平均・標準偏差をまとめて計算
+        # 先頭を NaN で埋めて全ウィンドウを同じ長さにし、10点以上そろう週（i >= 9）の分だけ求める
+        swpt_values = np.array([swpt[d] for d in sorted(swpt.keys())], dtype=float)
+        swpt_windows = sliding_window_view(np.concatenate((np.full(52, np.nan), swpt_values)), 53)[9:]
+        swpt_means = np.nanmean(swpt_windows, axis=1)
+        swpt_stds = np.nanstd(swpt_windows, axis=1, ddof=1)
+        # 全て同じ値のウィンドウは丸め誤差を残さず標準偏差0とする
+        swpt_stds[np.nanmax(swpt_windows, axis=1) == np.nanmin(swpt_windows, axis=1)] = 0
+
+        # 判定対象の週に揃えた配列で、前週比・z-score・各条件をまとめて計算する
+        # （前週のない先頭週や前週値が0の週は NaN とし、比較結果は不成立になる）
+        n = len(dates)
+        walcl_arr = np.array([walcl[d] for d in dates], dtype=float)
+        swpt_arr = np.array([swpt[d] for d in dates], dtype=float)
+        treast_arr = np.array([treast.get(d, 0) for d in dates], dtype=float)
+
+        def weekly_change(values):
+            prev = np.concatenate(([np.nan], values[:-1]))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(prev != 0, (values - prev) / prev * 100, np.nan)
+
+        walcl_change = weekly_change(walcl_arr)
+        swpt_change = weekly_change(swpt_arr)
+        treast_change = weekly_change(treast_arr)
+        swpt_change_abs_b = np.concatenate(([0.0], np.diff(swpt_arr) / 1000))
+
+        # z-score（直近52週、10点未満の週は0）
+        zscores = np.zeros(n)
+        window_means = np.full(n, np.nan)
+        window_stds = np.zeros(n)
+        window_means[9:] = swpt_means[:max(n - 9, 0)]
+        window_stds[9:] = swpt_stds[:max(n - 9, 0)]
+        has_std = window_stds > 0
+        zscores[has_std] = (swpt_arr[has_std] - window_means[has_std]) / window_stds[has_std]
+
+        # 条件1: Total Assets > +0.1%
+        total_assets_met = walcl_change > config.TOTAL_ASSETS_INCREASE_THRESHOLD
+        # 条件2: Treasury < +0.5%
+        treasury_met = treast_change < config.TREASURY_HOLDINGS_INCREASE_THRESHOLD
+        # 条件3: Swaps急増（週次%&増加額、または z-score）
+        swaps_met = (
+            (swpt_arr / 1000 >= config.SWAPS_MINIMUM_VALUE)
+            & (swpt_change >= config.SWAPS_SURGE_THRESHOLD_PCT)
+            & (swpt_change_abs_b >= config.SWAPS_SURGE_THRESHOLD_ABS)
+        ) | (zscores >= config.SWAPS_SURGE_ZSCORE_THRESHOLD)
+
+        # 条件4: USDJPY（円安進行、または高水準&高ボラ）。USDJPYのない週は NaN で不成立
+        usdjpy_values = np.array([usdjpy_data[d]["value"] if d in usdjpy_data else np.nan for d in dates], dtype=float)
+        usdjpy_week_changes = np.array([usdjpy_data[d]["change"] if d in usdjpy_data else np.nan for d in dates], dtype=float)
+        usdjpy_met = (usdjpy_week_changes >= config.USDJPY_WEAKENING_THRESHOLD) | (
+            (usdjpy_values >= config.USDJPY_HIGH_LEVEL)
+            & (np.abs(usdjpy_week_changes) >= config.USDJPY_HIGH_VOLATILITY)
+        )
+
+        # スコア（成立した条件の数）とシグナル判定
+        scores = total_assets_met.astype(int) + treasury_met + swaps_met + usdjpy_met
+        signal_names = np.where(
+            scores >= config.HIDDEN_QE_SIGNAL_ON, "ON",
+            np.where(scores >= config.HIDDEN_QE_SIGNAL_WATCH, "WATCH", "OFF"),
+        )
+
+        # 週次シグナルは列ごとの配列で持つ（行ごとにキー名を繰り返さない）
+        weekly_conditions = {
+            "total_assets": total_assets_met.tolist(),
+            "treasury": treasury_met.tolist(),
+            "swaps": swaps_met.tolist(),
+            "usdjpy": usdjpy_met.tolist(),
+        }
+        weekly_scores = scores.tolist()
+        weekly_signal_names = signal_names.tolist()
+
+        for i, (date, score) in enumerate(zip(dates, weekly_scores)):
+            # OFF→WATCH以上（score>=2）への転換を検出
+            # 前週がscore<2で、今週がscore>=2の場合に記録
+            if prev_score < 2 and score >= 2:
+                transitions.append({
                     "date": date,
-                    "signal": signal,
                     "score": score,
-                    "conditions": conditions
+                    "signal": weekly_signal_names[i],
+                    "conditions": {name: column[i] for name, column in weekly_conditions.items()}
                 })
 
-                # OFF→WATCH以上（score>=2）への転換を検出
-                # 前週がscore<2で、今週がscore>=2の場合に記録
-                if prev_score < 2 and score >= 2:
-                    transitions.append({
-                        "date": date,
-                        "score": score,
-                        "signal": signal,
-                        "conditions": conditions
-                    })
-
-                prev_score = score
+            prev_score = score
 
-            except Exception as e:
-                print(f"シグナル判定エラー ({date}): {e}")
-                continue
+        weekly_signals = {
+            "dates": dates,
+            "signals": weekly_signal_names,
+            "scores": weekly_scores,
+            "conditions": weekly_conditions,
+        }
 
         # スコア分布の統計情報を計算
         score_distribution = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0}
-        for sig in weekly_signals:
-            s = sig["score"]
-            if s in score_distribution:
-                score_distribution[s] += 1
+        for score in weekly_scores:
+            if score in score_distribution:
+                score_distribution[score] += 1
 
         stats = {
-            "total_weeks": len(weekly_signals),
+            "total_weeks": len(weekly_scores),
             "score_distribution": score_distribution,
             "transitions_count": len(transitions),
             "by_score": {
@@ -655,57 +1050,281 @@ def get_arthur_scenario_history():
             }
         }
 
+        log_recovered("arthur_history")
+
         # BTC価格が取得できなかった場合はエラーとして返す
+        # （数年分の価格・週次シグナルで大きくなるため、対応クライアントにはgzip圧縮して返す）
         if not btc_prices:
-            return jsonify({
-                "error": btc_error or "BTC価格データの取得に失敗しました。yfinanceの問題かもしれません。",
+            return json_response(orjson.dumps({
+                "error": btc_error or "BTC価格データの取得に失敗しました。Yahoo Financeの応答を確認してください。",
                 "btc_prices": [],
                 "transitions": transitions,
                 "on_transitions": transitions,  # 後方互換性
                 "weekly_signals": weekly_signals,
                 "stats": stats,
                 "period": {"start": start_date.strftime('%Y-%m-%d'), "end": end_date.strftime('%Y-%m-%d')}
-            })
+            }, option=ORJSONProvider.OPTIONS))
 
-        return jsonify({
+        return json_response(orjson.dumps({
             "btc_prices": btc_prices,
             "transitions": transitions,
             "on_transitions": transitions,  # 後方互換性
             "weekly_signals": weekly_signals,
             "stats": stats,
             "period": {"start": start_date.strftime('%Y-%m-%d'), "end": end_date.strftime('%Y-%m-%d')}
-        })
+        }, option=ORJSONProvider.OPTIONS))
 
     except Exception as e:
         # 予期せぬエラーもJSONで返す（500で落とさない）
-        print(f"Arthur Scenario API エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        log_failure("arthur_history", "❌ Arthur Scenario API エラー: %s", e)
         return jsonify({
             "error": f"サーバーエラー: {str(e)}",
             "transitions": [],
             "on_transitions": [],  # 後方互換性
             "btc_prices": [],
-            "weekly_signals": [],
+            "weekly_signals": EMPTY_WEEKLY_SIGNALS,
             "stats": {"total_weeks": 0, "score_distribution": {}, "transitions_count": 0}
         })
 
 
+GZIP_MIN_SIZE = 512  # これより小さいレスポンスは圧縮しない
+
+
+def json_response(body, etag=None):
+    """
+    JSONバイト列からレスポンスを作成（クライアントが対応していればgzip圧縮する）
+
+    etag を指定すると ETag を付ける。gzip と非圧縮ではバイト列が異なるため、
+    gzip 時は "-gz" を付けてエンコーディングごとに別の値にする。
+    """
+    response = app.response_class(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if len(body) >= GZIP_MIN_SIZE and "gzip" in request.accept_encodings:
+        # set_data で Content-Length も圧縮後のサイズに更新される
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers["Content-Encoding"] = "gzip"
+        if etag is not None:
+            etag += "-gz"
+    if etag is not None:
+        response.set_etag(etag)
+    return response
+
+
+# 計算済みの /api/data レスポンス（score_modeごとに (取得結果, JSONバイト列, ETag)）
+# 取得結果がキャッシュから返された同一オブジェクトであれば、シグナル計算と直列化を省略する
+_response_cache: dict = {}
+
+
+def _live_response(body, etag):
+    """
+    最新データのレスポンス（ポーリング間隔より短い期間はブラウザのキャッシュも許可する）
+
+    データが更新されていなければ If-None-Match の一致で304を返し、本文の転送を省略する。
+    """
+    response = json_response(body, etag)
+    response.headers["Cache-Control"] = f"public, max-age={config.CACHE_TTL_API_DATA // 2}"
+    return response.make_conditional(request)
+
+
+# =============================================================================
+# 最後に成功したレスポンス（score_modeごと）
+# 取得失敗時はこれを is_fallback=True として返す。再起動後に備えて CACHE_FILE にも保存する
+# （保存は専用スレッドで行い、リクエスト処理を待たせない）
+# =============================================================================
+LAST_GOOD: dict = {}
+_last_good_loaded = False
+# フォールバック応答のJSONバイト列（障害中は同じ内容を返し続けるため、直列化は1回だけ行う）
+_fallback_bytes: dict = {}
+_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-io")
+
+
+def _write_last_good(snapshot):
+    # 一時ファイルに書いてから置き換え、書き込み途中で落ちても壊れたファイルを残さない
+    tmp_path = f"{CACHE_FILE}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(snapshot))
+        os.replace(tmp_path, CACHE_FILE)
+    except (OSError, TypeError) as e:
+        logger.warning("⚠️ フォールバック用データの保存失敗: %s", e)
+
+
+def save_last_good(score_mode, response_data):
+    """成功したレスポンスを保持し、ファイルへの保存をバックグラウンドで行う"""
+    LAST_GOOD[score_mode] = response_data
+    _fallback_bytes.pop(score_mode, None)
+    _io_executor.submit(_write_last_good, dict(LAST_GOOD))
+
+
+def get_last_good(score_mode):
+    """フォールバック用のレスポンスを取得（メモリになければ起動後1回だけファイルから読み込む）"""
+    global _last_good_loaded
+    if not LAST_GOOD and not _last_good_loaded:
+        _last_good_loaded = True
+        try:
+            with open(CACHE_FILE, "rb") as f:
+                for mode, data in orjson.loads(f.read()).items():
+                    LAST_GOOD.setdefault(mode, data)
+        except (OSError, orjson.JSONDecodeError, AttributeError):
+            pass
+    return LAST_GOOD.get(score_mode)
+
+
+def get_fallback_bytes(score_mode):
+    """is_fallback=True を付けたフォールバック応答のJSONバイト列を取得（なければNone）"""
+    body = _fallback_bytes.get(score_mode)
+    if body is None:
+        last_good = get_last_good(score_mode)
+        if last_good is None:
+            return None
+        body = orjson.dumps({**last_good, "is_fallback": True}, option=ORJSONProvider.OPTIONS)
+        _fallback_bytes[score_mode] = body
+    return body
+
+
+@dataclass(slots=True)
+class Signal:
+    """
+    ダッシュボードの個別シグナル（to_json() でレスポンス用の辞書に変換する）
+
+    available=True: データ取得成功、スコア計算に含める
+    available=False: データ欠損、スコア計算から除外（reason に理由を記録）
+    """
+    name: str
+    status: str = "neutral"
+    weight: int = 1
+    value: str = "N/A"
+    details: dict | None = None
+    available: bool = False
+    reason: str = ""
+
+    def to_json(self):
+        """レスポンス用の辞書（details は設定したシグナルのみキーを出力する）"""
+        data = {"name": self.name, "status": self.status, "weight": self.weight, "value": self.value}
+        if self.details is not None:
+            data["details"] = self.details
+        data["available"] = self.available
+        data["reason"] = self.reason
+        return data
+
+
+# =============================================================================
+# シグナル判定ルール
+# (比較演算子, 閾値, status, weight) を上から順に評価し、最初に成立したものを採用する。
+# 比較演算子が None の行は無条件に成立（それまでのどれにも該当しない場合）。
+# どれにも該当しなければ neutral / weight 1。
+# =============================================================================
+SIGNAL_RULES = {
+    "liquidity": [
+        (operator.gt, config.LIQUIDITY_BULLISH_STRONG, "bullish", 2),
+        (operator.gt, config.LIQUIDITY_BULLISH_WEAK, "bullish", 1),
+        (operator.lt, config.LIQUIDITY_BEARISH_STRONG, "bearish", 2),
+    ],
+    "dxy": [
+        (operator.gt, config.DXY_BEARISH_STRONG, "bearish", 2),
+        (operator.gt, config.DXY_BEARISH_WEAK, "bearish", 1),
+        (operator.lt, config.DXY_BULLISH_STRONG, "bullish", 2),
+    ],
+    "fear_greed": [
+        (operator.le, config.FEAR_GREED_EXTREME_FEAR, "bullish", 2),
+        (operator.le, config.FEAR_GREED_FEAR, "bullish", 1),
+        (operator.ge, config.FEAR_GREED_EXTREME_GREED, "bearish", 2),
+        (operator.ge, config.FEAR_GREED_GREED, "bearish", 1),
+    ],
+    "exchange_flow": [
+        (operator.gt, config.EXCHANGE_NET_FLOW_BULLISH_STRONG, "bullish", 2),
+        (operator.gt, config.EXCHANGE_NET_FLOW_BULLISH_WEAK, "bullish", 1),
+        (operator.lt, config.EXCHANGE_NET_FLOW_BEARISH_STRONG, "bearish", 2),
+        (None, None, "bearish", 1),
+    ],
+    "funding_rate": [
+        (operator.gt, config.FUNDING_RATE_OVERHEAT, "bearish", 1),
+        (operator.lt, config.FUNDING_RATE_COOLING, "bullish", 1),
+    ],
+    "etf_flow": [
+        (operator.ge, config.ETF_FLOW_BULLISH_STRONG, "bullish", 2),
+        (operator.ge, config.ETF_FLOW_BULLISH_WEAK, "bullish", 1),
+        (operator.le, config.ETF_FLOW_BEARISH_STRONG, "bearish", 2),
+        (operator.le, config.ETF_FLOW_BEARISH_WEAK, "bearish", 1),
+    ],
+}
+
+
+def classify(value, rules):
+    """SIGNAL_RULES のルールで値を判定し (status, weight) を返す"""
+    for compare, threshold, status, weight in rules:
+        if compare is None or compare(value, threshold):
+            return status, weight
+    return "neutral", 1
+
+
+# スコア → 分析サマリーの文言（上から順に判定し、最初に一致した行を使う）
+SUMMARY_RULES = [
+    (operator.gt, 30, "強気のシグナルが優勢です。DXYのドル安傾向や市場心理の改善が追い風となっています。"),
+    (operator.gt, 10, "やや強気の環境。上昇基調だが、過熱感には注意が必要。"),
+    (operator.lt, -30, "弱気のシグナルが優勢です。マクロ経済の不透明感から、短期的な下落に警戒が必要です。"),
+    (operator.lt, -10, "やや弱気の環境。下落リスクに注意し、ポジション調整も視野に。"),
+]
+SUMMARY_NEUTRAL = "方向感が出にくい状況。様子見推奨。"
+
+
+def summarize(score):
+    """SUMMARY_RULES でスコアに対応するサマリー文を返す"""
+    for compare, threshold, text in SUMMARY_RULES:
+        if compare(score, threshold):
+            return text
+    return SUMMARY_NEUTRAL
+
+
+# スコア計算モード（config の値が不正な場合は momentum）
+SCORE_MODES = frozenset(('momentum', 'conservative'))
+DEFAULT_SCORE_MODE = getattr(config, 'SCORE_CALC_MODE', 'momentum')
+if DEFAULT_SCORE_MODE not in SCORE_MODES:
+    DEFAULT_SCORE_MODE = 'momentum'
+
+
+# 前回成功したデータもない場合の /api/data エラーレスポンスのうち、リクエストによらない部分
+API_DATA_ERROR_BASE = {
+    "btcPrice": 0,
+    "score": 0,
+    "summary": {"title": "⚠️ エラー", "text": "データの取得に失敗しました。しばらく待ってから再度お試しください。"},
+    "signals": [],
+    "is_fallback": True,
+}
+# 上記をエンコードした閉じ括弧なしのJSON（timestamp / error を連結して閉じる）
+API_DATA_ERROR_PREFIX = orjson.dumps(API_DATA_ERROR_BASE)[:-1]
+
+
 @app.route('/api/data')
 def get_data():
     """ダッシュボード用のデータを取得・計算してJSONで返す"""
+    global _last_request
+    _last_request = time.monotonic()
+
+    # 処理時間の計測は時計の変更に影響されない monotonic を使い、表示用の時刻は1回だけ生成する
+    start_time = time.monotonic()
+    timestamp = minute_timestamp()
+
+    # スコア計算モード（クエリパラメータ優先、なければconfig設定を使用）
+    score_mode = request.args.get('score_mode', DEFAULT_SCORE_MODE)
+    if score_mode not in SCORE_MODES:
+        score_mode = 'momentum'
+
     try:
-        print("📊 /api/data: データ並列取得・計算開始...")
-        start_time = datetime.now()
+        logger.info("📊 /api/data: データ並列取得・計算開始...")
+
+        # 常駐イベントループ上で非同期処理を実行（TTL内はキャッシュ済みの結果を使用）
+        results = run_async(get_all_data(), timeout=FETCH_RESULT_TIMEOUT)
 
-        # 非同期処理を同期的に実行
-        results = asyncio.run(fetch_all_data())
+        # 前回と同じ取得結果なら計算済みのレスポンスをそのまま返す
+        cached_response = _response_cache.get(score_mode)
+        if cached_response is not None and cached_response[0] is results:
+            log_recovered("api_data")
+            return _live_response(*cached_response[1:])
 
-        # エラーが発生した場合はNoneを設定
+        # 取得に失敗したデータは fetch_all でログ出力済みで、None になっている
         (balance_sheet, rrp, tga, dxy, ex_flow, macro_yh, btc, fg, fr, etf_flow,
-         walcl_weekly, swpt_data, treast_data, usdjpy_data) = [
-            res if not isinstance(res, Exception) else None for res in results
-        ]
+         walcl_weekly, swpt_data, treast_data, usdjpy_data) = results
 
         # BTC価格が取得できない場合は致命的エラーとみなし、フォールバックさせる
         if not btc or not btc.get("usd"):
@@ -725,150 +1344,128 @@ def get_data():
         # =====================================================================
 
         # USD流動性（FRED API必須）
-        sig_liquidity = {"name": "USD流動性", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_liquidity = Signal("USD流動性")
         if config.FRED_API_KEY == "YOUR_FRED_API_KEY_HERE" or not config.FRED_API_KEY:
-            sig_liquidity["reason"] = "FRED APIキー未設定"
+            sig_liquidity.reason = "FRED APIキー未設定"
         elif not all([balance_sheet, rrp is not None, tga]):
-            sig_liquidity["reason"] = "FRED データ取得失敗"
+            sig_liquidity.reason = "FRED データ取得失敗"
         elif liquidity:
-            sig_liquidity["available"] = True
-            sig_liquidity["value"] = f"${liquidity/1e6:.2f}T"
-            if liquidity > config.LIQUIDITY_BULLISH_STRONG: sig_liquidity.update({"status": "bullish", "weight": 2})
-            elif liquidity > config.LIQUIDITY_BULLISH_WEAK: sig_liquidity["status"] = "bullish"
-            elif liquidity < config.LIQUIDITY_BEARISH_STRONG: sig_liquidity.update({"status": "bearish", "weight": 2})
+            sig_liquidity.available = True
+            sig_liquidity.value = f"${liquidity/1e6:.2f}T"
+            sig_liquidity.status, sig_liquidity.weight = classify(liquidity, SIGNAL_RULES["liquidity"])
         signals.append(sig_liquidity)
 
         # DXY（Yahoo Finance）
-        sig_dxy = {"name": "DXY", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_dxy = Signal("DXY")
         if dxy and dxy.get("value"):
-            sig_dxy["available"] = True
-            sig_dxy["value"] = f'{dxy["value"]:.1f}'
-            if dxy["value"] > config.DXY_BEARISH_STRONG: sig_dxy.update({"status": "bearish", "weight": 2})
-            elif dxy["value"] > config.DXY_BEARISH_WEAK: sig_dxy["status"] = "bearish"
-            elif dxy["value"] < config.DXY_BULLISH_STRONG: sig_dxy.update({"status": "bullish", "weight": 2})
+            sig_dxy.available = True
+            sig_dxy.value = f'{dxy["value"]:.1f}'
+            sig_dxy.status, sig_dxy.weight = classify(dxy["value"], SIGNAL_RULES["dxy"])
         else:
-            sig_dxy["reason"] = "Yahoo Finance取得失敗"
+            sig_dxy.reason = "Yahoo Finance取得失敗"
         signals.append(sig_dxy)
 
         # Fear & Greed Index
-        sig_fg = {"name": "Fear & Greed", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_fg = Signal("Fear & Greed")
         if fg:
-            sig_fg["available"] = True
-            sig_fg["value"] = str(fg)
-            if fg <= config.FEAR_GREED_EXTREME_FEAR: sig_fg.update({"status": "bullish", "weight": 2})
-            elif fg <= config.FEAR_GREED_FEAR: sig_fg["status"] = "bullish"
-            elif fg >= config.FEAR_GREED_EXTREME_GREED: sig_fg.update({"status": "bearish", "weight": 2})
-            elif fg >= config.FEAR_GREED_GREED: sig_fg["status"] = "bearish"
+            sig_fg.available = True
+            sig_fg.value = str(fg)
+            sig_fg.status, sig_fg.weight = classify(fg, SIGNAL_RULES["fear_greed"])
         else:
-            sig_fg["reason"] = "API取得失敗"
+            sig_fg.reason = "API取得失敗"
         signals.append(sig_fg)
 
         # 取引所フロー（CoinGlass）
-        sig_flow = {"name": "取引所フロー", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_flow = Signal("取引所フロー")
         if ex_flow and ex_flow.get("net_flow") is not None:
-            sig_flow["available"] = True
+            sig_flow.available = True
             flow = ex_flow["net_flow"]
-            sig_flow["value"] = f"{flow:+.0f} BTC"
-            if flow > config.EXCHANGE_NET_FLOW_BULLISH_STRONG: sig_flow.update({"status": "bullish", "weight": 2})
-            elif flow > config.EXCHANGE_NET_FLOW_BULLISH_WEAK: sig_flow["status"] = "bullish"
-            elif flow < config.EXCHANGE_NET_FLOW_BEARISH_STRONG: sig_flow.update({"status": "bearish", "weight": 2})
-            else: sig_flow["status"] = "bearish"
+            sig_flow.value = f"{flow:+.0f} BTC"
+            sig_flow.status, sig_flow.weight = classify(flow, SIGNAL_RULES["exchange_flow"])
         else:
-            sig_flow["reason"] = "CoinGlass取得失敗"
+            sig_flow.reason = "CoinGlass取得失敗"
         signals.append(sig_flow)
 
         # Funding Rate
-        sig_fr = {"name": "Funding Rate", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_fr = Signal("Funding Rate")
         if fr is not None:
-            sig_fr["available"] = True
-            sig_fr["value"] = f"{fr:+.4f}%"
-            if fr > config.FUNDING_RATE_OVERHEAT: sig_fr["status"] = "bearish"
-            elif fr < config.FUNDING_RATE_COOLING: sig_fr["status"] = "bullish"
+            sig_fr.available = True
+            sig_fr.value = f"{fr:+.4f}%"
+            sig_fr.status, sig_fr.weight = classify(fr, SIGNAL_RULES["funding_rate"])
         else:
-            sig_fr["reason"] = "OKX API取得失敗"
+            sig_fr.reason = "OKX API取得失敗"
         signals.append(sig_fr)
 
         # Gold vs BTC ローテーションシグナル
-        sig_rotation = {"name": "Gold→BTC", "status": "neutral", "weight": 1, "value": "N/A", "available": False, "reason": ""}
+        sig_rotation = Signal("Gold→BTC")
         gold_change = macro_yh.get("gold_change") if macro_yh else None
         btc_change = btc.get("change") if btc else None
 
         if gold_change is not None and btc_change is not None:
-            sig_rotation["available"] = True
-            sig_rotation["value"] = f"Au:{gold_change:+.1f}% BTC:{btc_change:+.1f}%"
+            sig_rotation.available = True
+            sig_rotation.value = f"Au:{gold_change:+.1f}% BTC:{btc_change:+.1f}%"
 
             # Gold下落 + BTC上昇 = ローテーション発生（強気）
             if gold_change < -1.0 and btc_change > 1.0:
-                sig_rotation.update({"status": "bullish", "weight": 2})
+                sig_rotation.status, sig_rotation.weight = "bullish", 2
             elif gold_change < 0 and btc_change > 0:
-                sig_rotation["status"] = "bullish"
+                sig_rotation.status = "bullish"
             # Gold上昇 + BTC下落 = 安全資産へ逃避（弱気）
             elif gold_change > 1.0 and btc_change < -1.0:
-                sig_rotation.update({"status": "bearish", "weight": 2})
+                sig_rotation.status, sig_rotation.weight = "bearish", 2
             elif gold_change > 0 and btc_change < 0:
-                sig_rotation["status"] = "bearish"
+                sig_rotation.status = "bearish"
             # それ以外は中立
         else:
-            sig_rotation["reason"] = "Gold/BTC価格取得失敗"
+            sig_rotation.reason = "Gold/BTC価格取得失敗"
         signals.append(sig_rotation)
 
         # ETFフロー（Gist URL必須）
-        sig_etf = {"name": "ETFフロー", "status": "neutral", "weight": 1, "value": "N/A", "details": None, "available": False, "reason": ""}
+        sig_etf = Signal("ETFフロー")
         if not config.ETF_GIST_URL:
-            sig_etf["reason"] = "ETF_GIST_URL未設定"
+            sig_etf.reason = "ETF_GIST_URL未設定"
         elif etf_flow:
             if etf_flow.get("status") == "fetching":
-                sig_etf["value"] = "取得中..."
-                sig_etf["status"] = "loading"
-                sig_etf["reason"] = "取得中"
+                sig_etf.value = "取得中..."
+                sig_etf.status = "loading"
+                sig_etf.reason = "取得中"
             elif etf_flow.get("total_daily_flow") is not None:
-                sig_etf["available"] = True
+                sig_etf.available = True
                 flow = etf_flow["total_daily_flow"]
-                sig_etf["value"] = f"{flow:+.1f}M USD"
-                sig_etf["details"] = {
+                sig_etf.value = f"{flow:+.1f}M USD"
+                sig_etf.details = {
                     "date": etf_flow.get("date", ""),
                     "top_flows": etf_flow.get("top_flows", [])
                 }
-                if flow >= config.ETF_FLOW_BULLISH_STRONG:
-                    sig_etf.update({"status": "bullish", "weight": 2})
-                elif flow >= config.ETF_FLOW_BULLISH_WEAK:
-                    sig_etf["status"] = "bullish"
-                elif flow <= config.ETF_FLOW_BEARISH_STRONG:
-                    sig_etf.update({"status": "bearish", "weight": 2})
-                elif flow <= config.ETF_FLOW_BEARISH_WEAK:
-                    sig_etf["status"] = "bearish"
+                sig_etf.status, sig_etf.weight = classify(flow, SIGNAL_RULES["etf_flow"])
             else:
-                sig_etf["reason"] = "ETFデータ取得失敗"
+                sig_etf.reason = "ETFデータ取得失敗"
         else:
-            sig_etf["reason"] = "ETFデータ取得失敗"
+            sig_etf.reason = "ETFデータ取得失敗"
         signals.append(sig_etf)
 
         # 隠れQE（日本経由）シグナル（FRED API必須）
         # Arthur Hayes Thesis: FRBが日本市場を使って隠れた量的緩和を行っている兆候
-        hidden_qe = calculate_hidden_qe_signal(walcl_weekly, swpt_data, treast_data, usdjpy_data)
-
-        sig_hidden_qe = {
-            "name": "隠れQE",
-            "status": "neutral",
-            "weight": 1,
-            "value": f"{hidden_qe['signal']} ({hidden_qe['score']}/4)",
-            "details": hidden_qe,
-            "available": False,
-            "reason": ""
-        }
+        hidden_qe = cached_hidden_qe_signal(walcl_weekly, swpt_data, treast_data, usdjpy_data, updated_at=timestamp)
+
+        sig_hidden_qe = Signal(
+            "隠れQE",
+            value=f"{hidden_qe['signal']} ({hidden_qe['score']}/4)",
+            details=hidden_qe,
+        )
 
         # データ可用性チェック
         if config.FRED_API_KEY == "YOUR_FRED_API_KEY_HERE" or not config.FRED_API_KEY:
-            sig_hidden_qe["reason"] = "FRED APIキー未設定"
+            sig_hidden_qe.reason = "FRED APIキー未設定"
         elif not all([walcl_weekly, swpt_data, usdjpy_data]):
-            sig_hidden_qe["reason"] = "FRED/USDJPY取得失敗"
+            sig_hidden_qe.reason = "FRED/USDJPY取得失敗"
         else:
-            sig_hidden_qe["available"] = True
+            sig_hidden_qe.available = True
             # シグナルに応じてステータスを設定
             if hidden_qe["signal"] == "ON":
-                sig_hidden_qe.update({"status": "bullish", "weight": 2})
+                sig_hidden_qe.status, sig_hidden_qe.weight = "bullish", 2
             elif hidden_qe["signal"] == "WATCH":
-                sig_hidden_qe["status"] = "bullish"
+                sig_hidden_qe.status = "bullish"
             # OFF の場合は neutral のまま
 
         signals.append(sig_hidden_qe)
@@ -877,19 +1474,25 @@ def get_data():
         # 総合スコア計算
         # =====================================================================
         # available=True のシグナルのみでスコアを計算（データ欠損は除外）
-        available_signals = [s for s in signals if s.get("available", False)]
-        unavailable_signals = [s for s in signals if not s.get("available", False)]
+        # 各シグナルの重み合計を算出（available かつ neutral も weight を使用し対称性を確保）
+        # 欠損シグナルの振り分けと status ごとの合計を1回の走査で行う（bullish / bearish / neutral 以外は集計しない）
+        unavailable_signals = []
+        weight_by_status = {"bullish": 0, "bearish": 0, "neutral": 0}
+        for s in signals:
+            if not s.available:
+                unavailable_signals.append(s)
+            elif s.status in weight_by_status:
+                weight_by_status[s.status] += s.weight
 
         # coverage: データカバレッジ（取得成功率）
         # 80%未満の場合は警告を表示
         total_signal_count = len(signals)
-        available_count = len(available_signals)
+        available_count = total_signal_count - len(unavailable_signals)
         coverage = (available_count / total_signal_count * 100) if total_signal_count > 0 else 0
 
-        # 各シグナルの重み合計を算出（available かつ neutral も weight を使用し対称性を確保）
-        bull_w = sum(s["weight"] for s in available_signals if s["status"] == "bullish")
-        bear_w = sum(s["weight"] for s in available_signals if s["status"] == "bearish")
-        neut_w = sum(s["weight"] for s in available_signals if s["status"] == "neutral")
+        bull_w = weight_by_status["bullish"]
+        bear_w = weight_by_status["bearish"]
+        neut_w = weight_by_status["neutral"]
 
         # confidence（信頼度）: アクティブなシグナルの割合（available内での比率）
         # 値が高いほど「方向感のあるシグナルが多い」= 判断材料が豊富
@@ -897,11 +1500,6 @@ def get_data():
         active_w = bull_w + bear_w
         confidence = (active_w / total_w * 100) if total_w > 0 else 0
 
-        # スコア計算モード（クエリパラメータ優先、なければconfig設定を使用）
-        score_mode = request.args.get('score_mode', getattr(config, 'SCORE_CALC_MODE', 'momentum'))
-        if score_mode not in ('momentum', 'conservative'):
-            score_mode = 'momentum'
-
         if score_mode == "momentum":
             # -------------------------------------------------------------
             # Momentumモード: neutral を分母から除外
@@ -910,6 +1508,7 @@ def get_data():
             # 計算: score = (bull - bear) / (bull + bear) * 100
             # -------------------------------------------------------------
             score = ((bull_w - bear_w) / max(active_w, 1)) * 100
+            denominator_w = active_w
         else:
             # -------------------------------------------------------------
             # Conservativeモード: neutral も分母に含める
@@ -918,19 +1517,16 @@ def get_data():
             # 計算: score = (bull - bear) / (bull + bear + neutral) * 100
             # -------------------------------------------------------------
             score = ((bull_w - bear_w) / total_w * 100) if total_w > 0 else 0
+            denominator_w = total_w
 
-        summary_text = "方向感が出にくい状況。様子見推奨。"
-        if score > 30: summary_text = "強気のシグナルが優勢です。DXYのドル安傾向や市場心理の改善が追い風となっています。"
-        elif score > 10: summary_text = "やや強気の環境。上昇基調だが、過熱感には注意が必要。"
-        elif score < -30: summary_text = "弱気のシグナルが優勢です。マクロ経済の不透明感から、短期的な下落に警戒が必要です。"
-        elif score < -10: summary_text = "やや弱気の環境。下落リスクに注意し、ポジション調整も視野に。"
+        summary_text = summarize(score)
 
         # coverage低下時の警告をサマリーに追加
         if coverage < 80:
             summary_text = f"⚠️ データ欠損あり（カバレッジ{round(coverage)}%）。{summary_text}"
 
         response_data = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M UTC"),
+            "timestamp": timestamp,
             "btcPrice": btc.get("usd", 0),
             "score": round(score),
             "confidence": round(confidence),
@@ -942,33 +1538,68 @@ def get_data():
                 "neutralWeight": neut_w,
                 "availableCount": available_count,
                 "totalCount": total_signal_count,
-                "formula": f"({bull_w} - {bear_w}) / {active_w}" if score_mode == "momentum" else f"({bull_w} - {bear_w}) / {total_w}"
+                "formula": f"({bull_w} - {bear_w}) / {denominator_w}"
             },
-            "unavailableSignals": [{"name": s["name"], "reason": s.get("reason", "不明")} for s in unavailable_signals],
+            "unavailableSignals": [{"name": s.name, "reason": s.reason} for s in unavailable_signals],
             "summary": {"title": "💡 分析サマリー", "text": summary_text},
-            "signals": signals,
+            "signals": [s.to_json() for s in signals],
             "is_fallback": False
         }
 
-        duration = (datetime.now() - start_time).total_seconds()
-        print(f"✅ /api/data: 計算完了 (処理時間: {duration:.2f}秒)")
-        return jsonify(response_data)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ /api/data: 計算完了 (処理時間: %.2f秒)", time.monotonic() - start_time)
+        body = orjson.dumps(response_data, option=ORJSONProvider.OPTIONS)
+        etag = hashlib.md5(body).hexdigest()
+        _response_cache[score_mode] = (results, body, etag)
+        save_last_good(score_mode, response_data)
+        log_recovered("api_data")
+        return _live_response(body, etag)
 
     except Exception as e:
-        print(f"❌ /api/data: データ取得・計算中にエラー発生: {e}")
-        # エラー時はデフォルトレスポンスを返す
-        return jsonify({
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M UTC"),
-            "btcPrice": 0,
-            "score": 0,
-            "summary": {"title": "⚠️ エラー", "text": "データの取得に失敗しました。しばらく待ってから再度お試しください。"},
-            "signals": [],
-            "is_fallback": True,
-            "error": str(e)
-        }), 500
+        log_failure("api_data", "❌ /api/data: データ取得・計算中にエラー発生: %s", e)
+        # 前回成功したデータがあればキャッシュとして返す
+        fallback = get_fallback_bytes(score_mode)
+        if fallback is not None:
+            return json_response(fallback)
+        # エラー時はデフォルトレスポンスを返す（固定部分はエンコード済みのバイト列に可変部分だけを連結する）
+        response = json_response(
+            API_DATA_ERROR_PREFIX
+            + b',"timestamp":' + orjson.dumps(timestamp)
+            + b',"error":' + orjson.dumps(str(e)) + b'}'
+        )
+        response.status_code = 500
+        return response
 
 
-if __name__ == '__main__':
+_background_refresh_started = False
+
+
+def start_background_refresh():
+    """
+    バックグラウンドでデータを先読みし、以降も定期的に更新する（PREWARM=0 で無効化）
+
+    import しただけで上流APIへアクセスしないよう、serve() と gunicorn の
+    post_worker_init フック（gunicorn.conf.py）から呼び出す。
+    """
+    global _background_refresh_started
+    if _background_refresh_started or os.environ.get("PREWARM", "1") == "0":
+        return
+    _background_refresh_started = True
+    asyncio.run_coroutine_threadsafe(_prewarm(), _get_loop())
+    asyncio.run_coroutine_threadsafe(_warmer(), _get_loop())
+
+
+# WSGIサーバー用のエントリポイント（本番: Procfile の gunicorn server:app）
+application = app
+
+
+def serve():
+    """
+    開発用サーバーで起動する（FLASK_ENV=development のときのみデバッグモード）
+
+    本番では gunicorn（gthread）で起動する。先読みスレッドとキャッシュはプロセス内にあり、
+    fork 後の子プロセスにはスレッドが引き継がれないため --preload は使わない。
+    """
     print(f"🔑 FRED_API_KEY: {'設定済み (' + config.FRED_API_KEY[:4] + '...)' if config.FRED_API_KEY and config.FRED_API_KEY != 'YOUR_FRED_API_KEY_HERE' else '未設定'}")
     print(f"🔑 ETF_GIST_URL: {'設定済み' if config.ETF_GIST_URL else '未設定'}")
 
@@ -978,4 +1609,12 @@ if __name__ == '__main__':
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
     else:
         print("📊 BTCシグナルダッシュボード起動中...")
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        debug = os.environ.get("FLASK_ENV") == "development"
+        # デバッグ時のリローダーでは、実際にリクエストを処理する子プロセスでのみ開始する
+        if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            start_background_refresh()
+        app.run(debug=debug, host='0.0.0.0', port=int(os.environ.get("PORT", 5000)), threaded=True)
+
+
+if __name__ == '__main__':
+    serve()
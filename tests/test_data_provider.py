@@ -0,0 +1,113 @@
+"""
+data_provider.fetch_all の前回値代用のテスト
+
+各プロバイダーの取得失敗時の戻り値（None / 空の辞書 / 系列が全てNoneの辞書）で
+前回成功した結果に置き換わることを確認する。
+
+    python -m unittest discover tests
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_provider  # noqa: E402
+
+GOOD = {
+    "fred": {
+        "WALCL": {"value": 7e6, "change": 0.2},
+        "RRPONTSYD": {"value": 100},
+        "WTREGEN": {"value": 7e5},
+        "TREAST": {"value": 4e6, "change": 0.1},
+    },
+    "dxy": {"value": 99.0},
+    "exchange_flow": {"net_flow": -500},
+    "macro": {"gold": 2000, "gold_change": -2},
+    "btc": {"usd": 60000, "jpy": None, "change": 2},
+    "fear_greed": 20,
+    "funding_rate": 0.01,
+    "etf_flow": {"total_daily_flow": 120},
+    "swpt": {"value": 1000},
+    "usdjpy": {"value": 150},
+}
+
+PROVIDERS = {
+    "fred": "get_fred_data_batch",
+    "dxy": "get_dxy",
+    "exchange_flow": "get_exchange_flow",
+    "macro": "get_macro_data",
+    "btc": "get_btc_price",
+    "fear_greed": "get_fear_greed_index",
+    "funding_rate": "get_funding_rate",
+    "etf_flow": "get_etf_flow",
+    "swpt": "get_fred_data_with_stats",
+    "usdjpy": "get_usdjpy",
+}
+
+
+def fetch_with(values):
+    """各プロバイダーが values の値を返す状態で fetch_all を実行"""
+    patches = []
+    for key, name in PROVIDERS.items():
+        async def provider(*args, _value=values[key], **kwargs):
+            return _value
+        patches.append(mock.patch.object(data_provider, name, provider))
+    for p in patches:
+        p.start()
+    try:
+        return asyncio.run(data_provider.fetch_all(session=None))
+    finally:
+        for p in patches:
+            p.stop()
+
+
+class LastSuccessTest(unittest.TestCase):
+    def setUp(self):
+        data_provider._last_success.clear()
+        fetch_with(GOOD)
+
+    def test_none_uses_last_success(self):
+        results = fetch_with({**GOOD, "dxy": None, "fear_greed": None})
+        self.assertEqual(results["dxy"], GOOD["dxy"])
+        self.assertEqual(results["fear_greed"], GOOD["fear_greed"])
+
+    def test_empty_dict_uses_last_success(self):
+        # get_btc_price / get_macro_data は失敗時に {} を返す
+        results = fetch_with({**GOOD, "btc": {}, "macro": {}})
+        self.assertEqual(results["btc"], GOOD["btc"])
+        self.assertEqual(results["macro"], GOOD["macro"])
+
+    def test_fred_all_none_uses_last_success(self):
+        # get_fred_data_batch は失敗時に {series_id: None} を返す
+        failed = dict.fromkeys(data_provider.DASHBOARD_FRED_SERIES)
+        results = fetch_with({**GOOD, "fred": failed})
+        self.assertEqual(results["fred"], GOOD["fred"])
+
+    def test_fred_merges_per_series(self):
+        partial = {**GOOD["fred"], "WALCL": {"value": 7.1e6, "change": 1.0}, "TREAST": None}
+        results = fetch_with({**GOOD, "fred": partial})
+        self.assertEqual(results["fred"]["WALCL"], partial["WALCL"])
+        self.assertEqual(results["fred"]["TREAST"], GOOD["fred"]["TREAST"])
+
+    def test_fred_timeout_uses_last_success(self):
+        results = fetch_with({**GOOD, "fred": None})
+        self.assertEqual(results["fred"], GOOD["fred"])
+
+    def test_failure_not_recorded_as_success(self):
+        fetch_with({**GOOD, "btc": {}})
+        results = fetch_with({**GOOD, "btc": {}})
+        self.assertEqual(results["btc"], GOOD["btc"])
+
+    def test_expired_last_success_not_used(self):
+        with mock.patch.object(data_provider.config, "CACHE_STALE_API_DATA", 0):
+            results = fetch_with({**GOOD, "btc": {}, "dxy": None})
+        self.assertEqual(results["btc"], {})
+        self.assertIsNone(results["dxy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
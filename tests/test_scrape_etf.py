@@ -0,0 +1,58 @@
+"""
+scripts/scrape_etf.py の行テキスト取得のテスト
+
+CoinGlassと同じ構造のページ（tests/fixtures/coinglass_etf_flow.html）から、WebDriver の row.text と
+同じ形式のテキストが得られることを確認する。
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import scrape_etf  # noqa: E402
+
+try:
+    import selectolax.lexbor  # noqa: F401
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+FIXTURE = os.path.join(ROOT, "tests", "fixtures", "coinglass_etf_flow.html")
+
+# 同じページを WebDriver で取得した場合の row.text
+# （セル同士は空白、セル内のブロック要素は改行で区切られ、非表示の要素は含まれない）
+EXPECTED_ROWS = [
+    "時間 GBTC IBIT FBTC ARKB BITB BTCO HODL BRRR EZBC BTCW その他 合計",
+    "2026-01-15 -65.80\n-0.3% +183.54\n41.2% +1.13K +12.40 +8.75 +2.10 +5.60 +1.25 +3.30 +0.90 +4.20 +1.29K",
+    "2026-01-14 - - - - - - - - - - - -",
+]
+
+
+@unittest.skipUnless(HAS_SELECTOLAX, "selectolax が未インストール")
+class TableRowTextTest(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE, encoding="utf-8") as f:
+            self.rows = scrape_etf.parse_table_row_texts(f.read())
+
+    def test_matches_webdriver_row_text(self):
+        self.assertEqual(self.rows, EXPECTED_ROWS)
+
+    def test_block_elements_are_not_merged(self):
+        # 別のdivにある数値が "+183.5441.2%" のように連結されない
+        self.assertNotIn("+183.5441.2", self.rows[1])
+        self.assertIn("+183.54", scrape_etf.NUM_RE.findall(self.rows[1]))
+
+    def test_inline_suffix_is_kept(self):
+        self.assertIn("+1.13K", scrape_etf.NUM_RE.findall(self.rows[1]))
+
+    def test_no_data_row_is_skipped(self):
+        self.assertIsNone(scrape_etf._extract_row(self.rows[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()